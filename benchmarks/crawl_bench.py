@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""End-to-end checker benchmark against a local stand-in for hstechdocs.
+
+Usage: python benchmarks/crawl_bench.py [--latency MS] [--repeat N] [--concurrency N]
+                                        [--browser chrome [--page-load lean full]]
+
+Every product in fortra_releasenote_urls.txt is served from
+benchmarks/pages/manifest.json, at the same path, by a local HTTP server
+that waits --latency ms before each reply. A page is one of the recorded
+pages in benchmarks/pages, rendered with that product's name, version and
+release date. h5_path.htm hits the h3 -> h5 path, text_fallback.htm the
+page-text fallback and not_found.htm the not-found path.
+
+Modes:
+  sequential   one page at a time (in a browser with --browser, like the old scripts)
+  concurrent   --concurrency pages at a time, same fetch path as sequential
+  http-first   concurrent, plain HTTP first and the browser only where needed
+
+With --browser, --page-load lean full runs every mode with lean page
+loading (the default: eager load, images / fonts / CSS / analytics
+blocked) and with full page loading, for a before/after comparison. The
+server answers requests for the pages' stylesheets, scripts and images with
+a 404 after the same latency, so every asset the browser loads costs a round
+trip.
+
+For each mode it reports throughput (median of --repeat runs), time spent
+downloading, extracting and in the browser (summed over all pages), and the
+peak Python memory of one extra run under tracemalloc. Page cache and
+extraction memo are off so every run does the full work.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fortra_check.crawl import crawl  # noqa: E402
+from fortra_check.drivers import BROWSERS, driver_factory  # noqa: E402
+from fortra_check.extract import NOT_FOUND  # noqa: E402
+from fortra_check.fetch import BROWSER, Fetcher  # noqa: E402
+from fortra_check.readiness import ReadyTimes  # noqa: E402
+from fortra_check.rules import RuleRegistry  # noqa: E402
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+MODES = ('sequential', 'concurrent', 'http-first')
+
+
+def render_pages(manifest):
+    """{path: (html bytes, expected version)} for every page in the manifest."""
+    templates = {}
+    for filename in manifest['templates']:
+        with open(os.path.join(PAGES_DIR, filename), 'r', encoding='utf-8') as f:
+            templates[filename] = f.read()
+    pages = {}
+    for page in manifest['pages']:
+        recorded = manifest['templates'][page['template']]
+        html = templates[page['template']].replace(recorded['name'], page['name'])
+        if recorded['version']:
+            html = html.replace(f"Version {recorded['version']}", f"Version {page['version']}", 1)
+            html = html.replace(recorded['date'], page['date'], 1)
+        pages[page['path']] = (html.encode('utf-8'), page['version'])
+    return pages
+
+
+def start_server(pages, latency):
+    class PageHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            page = pages.get(self.path)
+            if page is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(page[0])))
+            self.end_headers()
+            self.wfile.write(page[0])
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class TimedFetcher(Fetcher):
+    """Fetcher that sums the time spent in each stage over all pages."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stage_lock = threading.Lock()
+        self.stages = {'static': 0.0, 'browser': 0.0, 'extract': 0.0, 'static_extract': 0.0}
+        self.local = threading.local()
+
+    def timed(self, stage, call, *args):
+        start = time.perf_counter()
+        try:
+            return call(*args)
+        finally:
+            with self.stage_lock:
+                self.stages[stage] += time.perf_counter() - start
+
+    def fetch_static(self, url, deadline=None):
+        self.local.in_static = True
+        try:
+            return self.timed('static', super().fetch_static, url, deadline)
+        finally:
+            self.local.in_static = False
+
+    def fetch_browser(self, url, deadline=None):
+        return self.timed('browser', super().fetch_browser, url, deadline)
+
+    def extract(self, page_source, url):
+        if getattr(self.local, 'in_static', False):
+            # Part of fetch_static's time; kept apart to get the download time
+            start = time.perf_counter()
+            result = self.timed('extract', super().extract, page_source, url)
+            with self.stage_lock:
+                self.stages['static_extract'] += time.perf_counter() - start
+            return result
+        return self.timed('extract', super().extract, page_source, url)
+
+
+def run_mode(mode, urls, expected, args, state_dir, page_load='lean'):
+    """One full check of urls; returns (seconds, stages, wrong results)."""
+    factory = driver_factory(args.browser, lean=page_load == 'lean') if args.browser else None
+    fetcher = TimedFetcher(factory, browsers=args.concurrency if mode != 'sequential' else 1,
+                           modes_file=os.path.join(state_dir, 'fetch_modes.json'),
+                           ready_times=ReadyTimes(os.path.join(state_dir, 'ready_times.json')),
+                           parser=args.parser, rules=RuleRegistry.load(hits_file=None))
+    if mode != 'http-first' and factory is not None:
+        fetcher.modes = {url: BROWSER for url in urls}  # Browser only, like the old scripts
+    concurrency = 1 if mode == 'sequential' else args.concurrency
+
+    def check(url):
+        try:
+            return fetcher.fetch(url)[1]['version']
+        except Exception as e:
+            return f"Error: {e}"
+
+    start = time.perf_counter()
+    try:
+        versions = crawl(urls, check, concurrency=concurrency, per_host=concurrency)
+    finally:
+        fetcher.close()
+    elapsed = time.perf_counter() - start
+    wrong = [(url, got) for url, got in zip(urls, versions) if got != expected[url]]
+    return elapsed, fetcher.stages, wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=100, help='Server delay per request in ms (default: 100)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per mode (default: 3)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Pages at a time in concurrent modes (default: 8)')
+    parser.add_argument('--browser', choices=[b for b in BROWSERS if b != 'http'],
+                        help='Render pages in this headless browser (default: plain HTTP only)')
+    parser.add_argument('--page-load', nargs='+', choices=('lean', 'full'), default=['lean'],
+                        help='Browser page loading to compare (default: lean)')
+    parser.add_argument('--parser', default='auto', help='HTML parser backend (default: auto)')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    with open(os.path.join(PAGES_DIR, 'manifest.json'), 'r') as f:
+        pages = render_pages(json.load(f))
+    server = start_server(pages, args.latency / 1000)
+    base = f"http://127.0.0.1:{server.server_port}"
+    urls = [base + path for path in pages]
+    expected = {base + path: version or NOT_FOUND for path, (_, version) in pages.items()}
+
+    print(f"{len(urls)} pages, {args.latency:.0f} ms latency, browser: {args.browser or 'none'}")
+    page_loads = args.page_load if args.browser else ['lean']
+    print(f"{'Mode':<20}{'Wall s':>8}{'Pages/s':>9}{'Download s':>12}{'Extract s':>11}{'Browser s':>11}"
+          f"{'Peak MB':>9}  Wrong")
+    with tempfile.TemporaryDirectory() as state_dir:
+        for page_load in page_loads:
+            for mode in args.modes:
+                runs = [run_mode(mode, urls, expected, args, state_dir, page_load) for _ in range(args.repeat)]
+                elapsed, stages, wrong = sorted(runs, key=lambda run: run[0])[len(runs) // 2]
+
+                tracemalloc.start()
+                run_mode(mode, urls, expected, args, state_dir, page_load)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                label = f"{mode} ({page_load})" if args.browser else mode
+                download = stages['static'] - stages['static_extract']
+                print(f"{label:<20}{elapsed:>8.2f}{len(urls) / elapsed:>9.1f}{download:>12.2f}"
+                      f"{stages['extract']:>11.2f}{stages['browser']:>11.2f}{peak / 1e6:>9.1f}  {len(wrong)}")
+                for url, got in wrong:
+                    print(f"    {url}: got {got}, expected {expected[url]}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Per-page parse/extract time for each installed parser backend.
+
+Usage: python benchmarks/parse_bench.py [--repeat N] [PAGE ...]
+
+Pages default to benchmarks/pages/*.htm. Saved debug dumps
+(page_source_<product>.html) work too. 'bs4 full tree' is the previous
+extractor, which built a complete BeautifulSoup tree for every page.
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fortra_check.extract import extract_release  # noqa: E402
+from fortra_check.parsers import PARSERS, available_parsers  # noqa: E402
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+
+
+def full_tree_extract(page_source, url):
+    """The extractor as it was before parser backends: full tree, find/find_next."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page_source, 'html.parser')
+    h1_tag = soup.find('h1')
+    name = h1_tag.text.strip() if h1_tag else None
+    version = release_date = "Not found"
+    latest_h3 = soup.find('h3')
+    version_h5 = latest_h3.find_next('h5') if latest_h3 else None
+    if version_h5:
+        match = re.search(r'Version\s*:?\s*([\w\d.]+)', version_h5.text.strip(), re.IGNORECASE)
+        if match and re.search(r'\d', match.group(1)):
+            version = match.group(1)
+        date_p = version_h5.find_next('p', class_='release-date') if match else None
+        if date_p:
+            release_date = date_p.text.strip()
+    if version == "Not found" or release_date == "Not found":
+        soup.get_text()
+    return {'name': name, 'version': version, 'date': release_date}
+
+
+def time_call(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('pages', nargs='*', help='HTML files (default: benchmarks/pages/*.htm)')
+    parser.add_argument('--repeat', type=int, default=20, help='Timing repetitions per page; best is reported (default: 20)')
+    args = parser.parse_args()
+
+    pages = args.pages or sorted(glob.glob(os.path.join(PAGES_DIR, '*.htm')))
+    if not pages:
+        print("No pages to benchmark.", file=sys.stderr)
+        sys.exit(1)
+
+    backends = [('bs4 full tree', full_tree_extract)]
+    for name in available_parsers():
+        backends.append((name, lambda src, url, cls=PARSERS[name]: extract_release(src, url, cls)))
+    missing = [name for name in PARSERS if name not in available_parsers()]
+
+    print(f"{'Page':<28}{'KB':>7}  " + ''.join(f"{name:>16}" for name, _ in backends) + "   (ms per page, best of %d)" % args.repeat)
+    totals = [0.0] * len(backends)
+    for path in pages:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            page_source = f.read()
+        url = 'file://' + os.path.abspath(path)
+        timings = []
+        results = set()
+        for i, (name, func) in enumerate(backends):
+            seconds, result = time_call(lambda: func(page_source, url), args.repeat)
+            totals[i] += seconds
+            timings.append(seconds)
+            if name != 'bs4 full tree':
+                results.add((result['name'], result['version'], result['date']))
+        mismatch = '' if len(results) == 1 else '  MISMATCH: ' + '; '.join(map(str, sorted(results)))
+        print(f"{os.path.basename(path)[:27]:<28}{len(page_source) / 1024:>7.1f}  "
+              + ''.join(f"{t * 1000:>16.2f}" for t in timings) + mismatch)
+
+    print(f"{'Total':<37}" + ''.join(f"{t * 1000:>16.2f}" for t in totals))
+    if missing:
+        print(f"Not installed: {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
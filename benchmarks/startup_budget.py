@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Check that the CLI starts fast and imports no heavy modules before it needs them.
+
+Usage: python benchmarks/startup_budget.py [--budget SECONDS] [--runs N]
+
+Exits non-zero if the median wall time of `fortra_release_check.py --help`
+exceeds the budget, or if parsing arguments imports selenium, BeautifulSoup,
+urllib3 or an optional parser backend. Suitable for CI.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINT = os.path.join(ROOT, 'fortra_release_check.py')
+HEAVY_MODULES = ('selenium', 'webdriver_manager', 'bs4', 'urllib3', 'lxml', 'selectolax')
+
+IMPORT_PROBE = f"""
+import sys
+from fortra_check.cli import build_parser
+build_parser('probe').parse_args([])
+print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget', type=float, default=0.5, help='Maximum median seconds for --help (default: 0.5)')
+    parser.add_argument('--runs', type=int, default=7, help='Number of timed runs (default: 7)')
+    args = parser.parse_args()
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, ENTRY_POINT, '--help'], check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+
+    probe = subprocess.run([sys.executable, '-c', IMPORT_PROBE], cwd=ROOT, check=True, capture_output=True, text=True)
+    imported = probe.stdout.split()
+
+    print(f"--help median: {median * 1000:.0f} ms (budget {args.budget * 1000:.0f} ms, {args.runs} runs)")
+    print(f"Heavy modules imported while parsing arguments: {', '.join(imported) or 'none'}")
+
+    failed = False
+    if median > args.budget:
+        print("FAIL: startup over budget", file=sys.stderr)
+        failed = True
+    if imported:
+        print("FAIL: heavy modules must be imported lazily", file=sys.stderr)
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared engine for the Fortra release-note checker scripts."""
@@ -0,0 +1,71 @@
+"""On-disk page cache revalidated with conditional GET (ETag / Last-Modified)."""
+import hashlib
+import json
+import os
+import sys
+import threading
+
+from . import settings
+
+
+class PageCache:
+    """One JSON file per URL holding the validators, last body and extracted release."""
+
+    def __init__(self, directory=settings.PAGE_CACHE_DIR):
+        self.directory = directory
+
+    def path_for(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url):
+        """Return the cached entry for url, or None."""
+        try:
+            with open(self.path_for(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if entry.get('url') != url:
+            return None
+        # Entries from before bodies were marked may be cut short by --stream
+        entry.setdefault('partial', True)
+        return entry
+
+    def put(self, url, headers, body, release, partial=False):
+        """Store body and release if the response carried validators to revalidate with.
+
+        partial marks a body cut short by an early-exit stream read; it is
+        only good for its release, not for reading the whole page again.
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'body': body,
+            'release': release,
+            'partial': partial,
+        }
+        path = self.path_for(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing page cache for {url}: {e}", file=sys.stderr)
+
+
+def conditional_headers(entry):
+    """If-None-Match / If-Modified-Since headers for a cached entry."""
+    headers = {}
+    if entry is None:
+        return headers
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
@@ -0,0 +1,163 @@
+"""Single command-line entry point for the release checker.
+
+Only argparse and the option definitions are imported at module level;
+the fetch engine (urllib3, parsers) is imported once arguments are parsed
+and selenium only when a browser is actually started.
+"""
+import sys
+import time
+
+from .options import build_parser
+
+
+def load_urls(path):
+    """Read URLs from the input file, one per line."""
+    try:
+        with open(path, 'r') as file:
+            return [line.strip() for line in file if line.strip()]
+    except FileNotFoundError:
+        print(f"Error: {path} not found.")
+        sys.exit(1)
+
+
+def make_fetcher(args, run_deadline=None):
+    """The Fetcher for parsed command-line args, shared by run, watch and shard workers."""
+    from .cache import PageCache
+    from .drivers import driver_factory
+    from .fetch import Fetcher
+    from .memo import ExtractionMemo
+
+    # Pages are fetched over plain HTTP first; the browser is only started
+    # for pages whose static HTML does not contain a version.
+    return Fetcher(driver_factory(args.browser, args.browser_path, args.driver_path, lean=not args.full_page_load),
+                   browsers=args.browsers,
+                   cache=None if args.no_cache else PageCache(),
+                   memo=None if args.no_cache else ExtractionMemo(),
+                   # Early exit would leave the older releases unread
+                   parser=args.parser, stream=args.stream and not args.release_history,
+                   page_timeout=args.page_timeout, retries=args.retries, run_deadline=run_deadline)
+
+
+def run(args):
+    """Check every URL in args.urls_file and write the reports; returns the number of rows."""
+    from .crawl import crawl
+    from .engine import check_url
+    from .history import HistoryStore
+    from .journal import RunJournal
+    from .report import ReportWriters, open_file, write_previous_versions
+
+    urls = load_urls(args.urls_file)
+    history = HistoryStore(args.history_db)
+    history.import_json(args.previous_versions)
+    journal = RunJournal()
+    resumed = journal.load() if args.resume else None
+    if resumed:
+        # Flag against the same previous versions as the interrupted run
+        run_id, previous_versions, done = resumed
+        journal.reopen()
+        print(f"Resuming run {run_id}: {len(done)} of {len(urls)} URLs already checked")
+    else:
+        if args.resume:
+            print("No interrupted run to resume; starting a new run")
+        previous_versions = history.previous_versions()
+        run_id = history.start_run()
+        done = {}
+        journal.start(run_id, previous_versions)
+
+    skipped = {}
+    if args.scheduled:
+        from .schedule import skipped_rows
+
+        # URLs that are not due are reported with their last observed row
+        skipped = skipped_rows([url for url in urls if url not in done], history, args)
+
+    timings = profiler = None
+    if args.timings or args.metrics or args.profile:
+        from .timing import RunProfiler, Timings
+
+        timings = Timings()
+        if args.profile:
+            profiler = RunProfiler(args.profile)
+            profiler.start()
+
+    # Walked pages' releases are recorded with their row, in emit()
+    known_releases = history.known_releases if args.release_history else None
+
+    def check(url):
+        if url in done:
+            return done[url]
+        if url in skipped:
+            return skipped[url]
+        row = check_url(url, fetcher, previous_versions, timings, known_releases)
+        journal.append(row)
+        return row
+
+    fetcher = make_fetcher(args, time.monotonic() + args.run_budget if args.run_budget else None)
+
+    discovery = None
+    if args.discover:
+        from .discover import start_background
+
+        # Shares the fetcher's connection pool and runs alongside the check
+        discovery = start_background(fetcher.http, args.urls_file, depth=args.discover_depth,
+                                     budget=args.discover_budget)
+
+    def emit(row):
+        if row['url'] not in skipped:
+            history.record(run_id, row)
+        reports.write(row)
+
+    # Check all URLs concurrently; each row is recorded and written out as
+    # soon as it and the rows before it are done, in input order
+    reports = ReportWriters(args.output, args.csv, args.jsonl)
+    complete = published = False
+    try:
+        if profiler is not None:
+            # One URL at a time in this thread, where the profiler is enabled
+            count = 0
+            for url in urls:
+                emit(check(url))
+                count += 1
+        else:
+            count = crawl(urls, check, concurrency=max(args.concurrency, args.browsers), per_host=args.per_host,
+                          on_result=emit)
+        complete = True
+    finally:
+        # Clean up: quit every browser even if the crawl was interrupted
+        if discovery is not None:
+            discovery.join()
+        fetcher.close()
+        published = reports.close(complete)
+        # Pages given up at --run-budget are error rows; the run stays open for --resume
+        finished = complete and not fetcher.run_exhausted
+        if complete and not finished:
+            print(f"Run budget of {args.run_budget:g}s ran out before every page was checked")
+        journal.close(finished)
+        if finished:
+            history.finish_run(run_id)
+            write_previous_versions(args.previous_versions, history.previous_versions())
+        history.close()
+
+    if timings is not None:
+        timings.summary()
+        if args.timings:
+            timings.write_json(args.timings)
+        if args.metrics:
+            timings.write_prometheus(args.metrics)
+    if profiler is not None:
+        profiler.stop()
+
+    if published and not args.no_open:
+        open_file(args.output)
+    return count
+
+
+def main(argv=None, default_browser='brave'):
+    parser = build_parser('Check Fortra release-note pages for new product versions.', single_run=True)
+    parser.set_defaults(browser=default_browser)
+    args = parser.parse_args(argv)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
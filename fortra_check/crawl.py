@@ -0,0 +1,46 @@
+"""Concurrent asyncio crawl of the URL list with global and per-host limits."""
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+def crawl(urls, check, concurrency=8, per_host=4, on_result=None):
+    """Run check(url) for every URL concurrently and return results in input order.
+
+    At most `concurrency` checks run at once, and at most `per_host` of them
+    against any one host. check is a blocking callable and runs in a thread.
+
+    If on_result is given, each result is passed to on_result(result) as soon
+    as it and every result before it are ready, still in input order, and is
+    not kept; crawl then returns the number of results.
+    """
+    return asyncio.run(crawl_async(urls, check, concurrency, per_host, on_result))
+
+
+async def crawl_async(urls, check, concurrency=8, per_host=4, on_result=None):
+    concurrency = max(1, concurrency)
+    loop = asyncio.get_running_loop()
+    global_limit = asyncio.Semaphore(concurrency)
+    host_limits = defaultdict(lambda: asyncio.Semaphore(max(1, per_host)))
+    pending = {}  # Finished results waiting for an earlier URL
+    emitted = 0
+
+    def emit(index, result):
+        nonlocal emitted
+        pending[index] = result
+        while emitted in pending:
+            on_result(pending.pop(emitted))
+            emitted += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async def run_one(index, url):
+            async with host_limits[urlparse(url).netloc], global_limit:
+                result = await loop.run_in_executor(executor, check, url)
+            if on_result is None:
+                return result
+            emit(index, result)
+
+        # gather() preserves the order of its arguments, not completion order
+        results = await asyncio.gather(*(run_one(index, url) for index, url in enumerate(urls)))
+    return results if on_result is None else emitted
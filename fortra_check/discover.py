@@ -0,0 +1,181 @@
+"""Incremental discovery of product release-note pages.
+
+Starting from the seed index pages, links under _ProductPages/ are followed
+breadth-first. A link of the form _ProductPages/<Brand>/<Page>.htm is a
+product page and is collected, not fetched; every other .htm page or
+directory there is an index page and is fetched, up to `depth` levels
+below the seeds and `budget` requests in total. Index pages are revalidated
+with their ETag / Last-Modified from the last discovery, so unchanged ones
+are neither downloaded nor parsed. Product URLs missing from the URL list
+are appended to it.
+
+    python -m fortra_check.discover [--depth 2] [--budget 30]
+"""
+import hashlib
+import sys
+import threading
+from html.parser import HTMLParser
+from urllib.parse import urldefrag, urljoin, urlparse
+
+from . import settings
+from .cache import conditional_headers
+from .crawl import crawl
+from .state import load_json, save_json
+
+SCOPE = '/_ProductPages/'
+
+
+class LinkCollector(HTMLParser):
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.links = set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            href = dict(attrs).get('href')
+            if href:
+                self.links.add(urldefrag(urljoin(self.base_url, href.strip()))[0])
+
+
+def classify(url):
+    """'product', 'index' or None (out of scope) for a link."""
+    parts = urlparse(url)
+    if parts.scheme not in ('http', 'https') or SCOPE not in parts.path:
+        return None
+    relative = parts.path.split(SCOPE, 1)[1]
+    if relative.count('/') == 1 and relative.lower().endswith('.htm'):
+        return 'product'
+    if relative == '' or relative.endswith('/') or relative.lower().endswith('.htm'):
+        return 'index'
+    return None
+
+
+class Discovery:
+    """Breadth-first crawl of the index pages, remembering validators and links per page."""
+
+    def __init__(self, http, seeds=settings.DISCOVERY_SEEDS, depth=settings.DISCOVERY_DEPTH,
+                 budget=settings.DISCOVERY_BUDGET, state_file=settings.DISCOVERY_FILE):
+        self.http = http
+        self.seeds = list(seeds)
+        self.depth = depth
+        self.budget = budget
+        self.state_file = state_file
+        self.state = load_json(state_file)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.unchanged = 0
+
+    def links_of(self, url):
+        """Links on index page url, from the last discovery if the page is unchanged."""
+        with self.lock:
+            known = self.state.get(url)
+            self.requests += 1
+        response = self.http.request('GET', url, headers=conditional_headers(known), preload_content=False)
+        try:
+            if response.status == 304 and known is not None:
+                with self.lock:
+                    self.unchanged += 1
+                return known['links']
+            if response.status >= 400:
+                print(f"Discovery: {url} returned HTTP {response.status}", file=sys.stderr)
+                return []
+            body = response.read()
+        finally:
+            response.release_conn()
+
+        digest = hashlib.sha1(body).hexdigest()
+        if known is not None and known.get('sha1') == digest:
+            links = known['links']  # No validators, but the same content as last time
+            with self.lock:
+                self.unchanged += 1
+        else:
+            collector = LinkCollector(url)
+            collector.feed(body.decode('utf-8', errors='replace'))
+            links = sorted(collector.links)
+        with self.lock:
+            self.state[url] = {'etag': response.headers.get('ETag'),
+                               'last_modified': response.headers.get('Last-Modified'),
+                               'sha1': digest, 'links': links}
+        return links
+
+    def safe_links_of(self, url):
+        try:
+            return self.links_of(url)
+        except Exception as e:
+            print(f"Discovery: {url} failed ({e})", file=sys.stderr)
+            return []
+
+    def run(self):
+        """Return the set of product page URLs reachable from the seeds."""
+        products = set()
+        seen = set(self.seeds)
+        level = list(self.seeds)
+        for _ in range(self.depth + 1):
+            level = level[:max(0, self.budget - self.requests)]
+            if not level:
+                break
+            next_level = []
+            for links in crawl(level, self.safe_links_of, concurrency=4, per_host=2):
+                for link in links:
+                    kind = classify(link)
+                    if kind == 'product':
+                        products.add(link)
+                    elif kind == 'index' and link not in seen:
+                        seen.add(link)
+                        next_level.append(link)
+            level = next_level
+        save_json(self.state_file, self.state)
+        return products
+
+
+def append_new_urls(path, found):
+    """Append the URLs in found that are not yet in the URL list; returns them."""
+    try:
+        with open(path, 'r') as f:
+            content = f.read()
+    except FileNotFoundError:
+        content = ''
+    known = {line.strip() for line in content.splitlines() if line.strip()}
+    new = sorted(found - known)
+    if new:
+        with open(path, 'a') as f:
+            if content and not content.endswith('\n'):
+                f.write('\n')
+            f.writelines(url + '\n' for url in new)
+    return new
+
+
+def discover(http, urls_file, **options):
+    """Run a discovery and append new product URLs to urls_file; returns the new URLs."""
+    discovery = Discovery(http, **options)
+    found = discovery.run()
+    new = append_new_urls(urls_file, found)
+    print(f"Discovery: {discovery.requests} index requests ({discovery.unchanged} unchanged), "
+          f"{len(found)} product pages, {len(new)} new")
+    for url in new:
+        print(f"  Added {url}")
+    return new
+
+
+def start_background(http, urls_file, **options):
+    """Run discover() in a thread alongside the check; join the returned thread before exiting."""
+    thread = threading.Thread(target=discover, args=(http, urls_file), kwargs=options, name='discovery')
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import urllib3
+
+    parser = argparse.ArgumentParser(description='Find product release-note pages missing from the URL list.')
+    parser.add_argument('--urls-file', default=settings.URLS_FILE)
+    parser.add_argument('--seed', action='append', help='Index page to start from (repeatable)')
+    parser.add_argument('--depth', type=int, default=settings.DISCOVERY_DEPTH)
+    parser.add_argument('--budget', type=int, default=settings.DISCOVERY_BUDGET)
+    args = parser.parse_args()
+    http = urllib3.PoolManager(headers={'User-Agent': settings.USER_AGENT},
+                               timeout=urllib3.Timeout(total=settings.HTTP_TIMEOUT))
+    discover(http, args.urls_file, seeds=args.seed or settings.DISCOVERY_SEEDS, depth=args.depth, budget=args.budget)
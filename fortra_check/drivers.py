@@ -0,0 +1,194 @@
+"""Selenium driver factories for each supported browser.
+
+Nothing here imports selenium or webdriver-manager until a factory is
+actually called, so choosing --browser http (or never needing a browser)
+costs no import time.
+
+By default drivers load pages lean: the eager page-load strategy (return
+at DOMContentLoaded; the readiness wait covers the rest) and no images,
+fonts, stylesheets or analytics. Chromium browsers block them through
+DevTools, Firefox through preferences; Safari has no equivalent.
+"""
+import os
+import sys
+from pathlib import Path
+
+from . import settings
+
+BROWSERS = ('brave', 'chrome', 'firefox', 'edge', 'safari', 'http')
+
+# Default browser binaries per platform; override with --browser-path
+BINARY_PATHS = {
+    'darwin': {
+        'brave': '/Applications/Brave Browser.app/Contents/MacOS/Brave Browser',
+        'chrome': '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+        'firefox': '/Applications/Firefox.app/Contents/MacOS/firefox',
+    },
+    'win32': {
+        'brave': r'C:\Program Files\BraveSoftware\Brave-Browser\Application\brave.exe',
+        'chrome': r'C:\Program Files\Google\Chrome\Application\chrome.exe',
+        'firefox': r'C:\Program Files\Mozilla Firefox\firefox.exe',
+        'edge': r'C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe',
+    },
+    'linux': {
+        'brave': '/usr/bin/brave-browser',
+        'chrome': '/usr/bin/google-chrome',
+        'firefox': '/usr/bin/firefox',
+    },
+}
+
+# URL patterns DevTools blocks in lean mode: images, fonts, stylesheets and analytics
+BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.webp', '*.ico', '*.bmp',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.css',
+    '*.mp4', '*.webm',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*hotjar.com*',
+    '*pendo.io*', '*hs-analytics.net*', '*hs-scripts.com*', '*cookielaw.org*', '*onetrust.com*',
+]
+
+# Firefox preferences with the same effect, as far as Firefox allows
+FIREFOX_LEAN_PREFS = {
+    'permissions.default.image': 2,
+    'gfx.downloadable_fonts.enabled': False,
+    'browser.display.use_document_fonts': 0,
+    'permissions.default.stylesheet': 2,
+    'privacy.trackingprotection.enabled': True,
+    'media.autoplay.default': 5,
+}
+
+# ChromeDriver installed by update_chromedriver.py
+CHROMEDRIVER_PATH = Path.home() / '.chromedrivers' / 'chromedriver'
+
+
+def default_binary(browser):
+    platform = 'linux' if sys.platform.startswith('linux') else sys.platform
+    return BINARY_PATHS.get(platform, {}).get(browser)
+
+
+def driver_factory(browser, binary_path=None, driver_path=None, lean=True):
+    """Return a zero-argument callable that starts a headless driver, or None for 'http'.
+
+    lean=False loads every resource and waits for the full page load, as
+    the original scripts did.
+    """
+    if browser == 'http':
+        return None
+    if browser not in BROWSERS:
+        raise ValueError(f"Unknown browser {browser!r}")
+    binary_path = binary_path or default_binary(browser)
+
+    def make_driver():
+        if browser in ('brave', 'chrome'):
+            return make_chromium(binary_path, driver_path, lean)
+        if browser == 'firefox':
+            return make_firefox(binary_path, driver_path, lean)
+        if browser == 'edge':
+            return make_edge(binary_path, driver_path, lean)
+        from selenium import webdriver
+
+        return webdriver.Safari()
+
+    return make_driver
+
+
+def make_chromium(binary_path, driver_path, lean=True):
+    """Headless Brave/Chrome through ChromeDriver."""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service as ChromeService
+
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')  # Run in headless mode (no GUI)
+    options.add_argument(f'--user-agent={settings.USER_AGENT}')
+    if lean:
+        lean_chromium_options(options)
+    if binary_path:
+        options.binary_location = binary_path
+    # https://googlechromelabs.github.io/chrome-for-testing/#stable
+    driver_path = driver_path or chromedriver_path(binary_path)
+    driver = webdriver.Chrome(service=ChromeService(driver_path), options=options)
+    if lean:
+        block_resources(driver)
+    return driver
+
+
+def lean_chromium_options(options):
+    options.page_load_strategy = 'eager'
+    options.add_argument('--blink-settings=imagesEnabled=false')
+    options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+
+
+def block_resources(driver):
+    """Block BLOCKED_URLS for every page this Chromium driver loads."""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URLS})
+    except Exception as e:
+        print(f"Could not enable request blocking: {e}", file=sys.stderr)
+
+
+def chromedriver_path(binary_path=None):
+    """The stored ChromeDriver for the browser's major version, else ~/.chromedrivers/chromedriver,
+    else webdriver-manager, else Selenium Manager."""
+    if binary_path:
+        from .driverstore import DriverStore, browser_version
+
+        version = browser_version(binary_path)
+        try:
+            stored = version and DriverStore().get(version.split('.')[0])
+        except ValueError:
+            stored = None  # No Chrome for Testing drivers for this platform
+        if stored:
+            return str(stored)
+    if CHROMEDRIVER_PATH.exists():
+        return str(CHROMEDRIVER_PATH)
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+    except ImportError:
+        return None  # Let Selenium Manager locate a driver
+    return ChromeDriverManager().install()
+
+
+def make_firefox(binary_path, driver_path, lean=True):
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options as FirefoxOptions
+    from selenium.webdriver.firefox.service import Service as FirefoxService
+
+    options = FirefoxOptions()
+    options.add_argument('-headless')
+    if lean:
+        options.page_load_strategy = 'eager'
+        for name, value in FIREFOX_LEAN_PREFS.items():
+            options.set_preference(name, value)
+    if binary_path and os.path.exists(binary_path):
+        options.binary_location = binary_path
+    if driver_path is None:
+        try:
+            from webdriver_manager.firefox import GeckoDriverManager
+            driver_path = GeckoDriverManager().install()
+        except ImportError:
+            pass
+    return webdriver.Firefox(service=FirefoxService(driver_path), options=options)
+
+
+def make_edge(binary_path, driver_path, lean=True):
+    from selenium import webdriver
+    from selenium.webdriver.edge.options import Options as EdgeOptions
+    from selenium.webdriver.edge.service import Service as EdgeService
+
+    options = EdgeOptions()
+    options.add_argument('--headless')
+    if lean:
+        lean_chromium_options(options)
+    if binary_path:
+        options.binary_location = binary_path
+    if driver_path is None:
+        try:
+            from webdriver_manager.microsoft import EdgeChromiumDriverManager
+            driver_path = EdgeChromiumDriverManager().install()
+        except ImportError:
+            pass
+    driver = webdriver.Edge(service=EdgeService(driver_path), options=options)
+    if lean:
+        block_resources(driver)
+    return driver
@@ -0,0 +1,117 @@
+"""Side-by-side ChromeDriver store shared by update_chromedriver.py and the checker.
+
+Drivers are kept in ~/.chromedrivers/<major>-<platform>/, one per Chrome
+major version and platform, so Brave and Chrome on different majors each
+have a matching driver. store.json records when each one was last used;
+beyond STORE_SIZE drivers the least recently used are removed.
+
+Browser versions are probed with `<browser> --version` only when the
+binary changed since the last probe (a different inode, size or mtime).
+"""
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .state import load_json, save_json
+
+DRIVER_DIR = Path.home() / '.chromedrivers'
+STORE_FILE = DRIVER_DIR / 'store.json'
+PROBES_FILE = DRIVER_DIR / 'browser_versions.json'
+STORE_SIZE = 4  # Drivers kept before the least recently used is removed
+
+
+def driver_platform():
+    """Chrome for Testing platform name of this machine, e.g. mac-arm64 or linux64."""
+    machine = platform.machine().lower()
+    if sys.platform == 'darwin':
+        if machine == 'arm64':
+            return 'mac-arm64'
+        if machine == 'x86_64':
+            return 'mac-x64'
+    elif sys.platform.startswith('linux'):
+        if machine in ('x86_64', 'amd64'):
+            return 'linux64'
+    elif sys.platform == 'win32':
+        return 'win64' if machine in ('amd64', 'arm64') else 'win32'
+    raise ValueError(f"Unsupported platform: {sys.platform} {machine}")
+
+
+def driver_name(platform_name):
+    return 'chromedriver.exe' if platform_name.startswith('win') else 'chromedriver'
+
+
+def browser_version(binary_path, probes_file=PROBES_FILE):
+    """Version of the browser at binary_path, probed once per installed binary; None if unknown."""
+    try:
+        stat = os.stat(binary_path)
+    except OSError:
+        return None
+    fingerprint = [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+    probes = load_json(probes_file)
+    known = probes.get(str(binary_path))
+    if known and known['fingerprint'] == fingerprint:
+        return known['version']
+    try:
+        result = subprocess.run([str(binary_path), '--version'], capture_output=True, text=True, check=True)
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    # Output like: "Brave Browser 141.1.83.109"
+    words = result.stdout.split()
+    if not words:
+        return None
+    probes[str(binary_path)] = {'fingerprint': fingerprint, 'version': words[-1]}
+    save_json(probes_file, probes)
+    return words[-1]
+
+
+class DriverStore:
+    """ChromeDriver binaries per (major, platform) with least-recently-used eviction."""
+
+    def __init__(self, root=DRIVER_DIR, size=STORE_SIZE):
+        self.root = Path(root)
+        self.size = size
+        self.index_file = self.root / STORE_FILE.name
+
+    def path(self, major, platform_name=None):
+        """Where the driver for major / platform_name lives (whether or not it is installed)."""
+        platform_name = platform_name or driver_platform()
+        return self.root / f'{major}-{platform_name}' / driver_name(platform_name)
+
+    def entries(self):
+        return load_json(self.index_file)
+
+    def get(self, major, platform_name=None):
+        """Path of the installed driver for major, marking it used; None if there is none."""
+        platform_name = platform_name or driver_platform()
+        path = self.path(major, platform_name)
+        if not path.exists():
+            return None
+        entries = self.entries()
+        key = f'{major}/{platform_name}'
+        entries.setdefault(key, {})['last_used'] = time.time()
+        save_json(self.index_file, entries)
+        return path
+
+    def version(self, major, platform_name=None):
+        """Full version of the installed driver for major, as recorded by add()."""
+        platform_name = platform_name or driver_platform()
+        return self.entries().get(f'{major}/{platform_name}', {}).get('version')
+
+    def add(self, major, platform_name, version):
+        """Record a driver just installed at path(major, platform_name), then evict beyond size."""
+        entries = self.entries()
+        key = f'{major}/{platform_name}'
+        entries[key] = {'version': version, 'last_used': time.time()}
+        by_age = sorted(entries, key=lambda name: entries[name].get('last_used', 0), reverse=True)
+        for stale in by_age[self.size:]:
+            if stale == key:
+                continue
+            stale_major, stale_platform = stale.split('/')
+            shutil.rmtree(self.path(stale_major, stale_platform).parent, ignore_errors=True)
+            del entries[stale]
+            print(f"Removed least recently used ChromeDriver {stale}")
+        save_json(self.index_file, entries)
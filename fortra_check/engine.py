@@ -0,0 +1,50 @@
+"""Per-URL check: fetch, extract and flag one release-note page."""
+from contextlib import nullcontext
+
+from .extract import NOT_FOUND, dump_page_source, flag_for, product_name_from_url, walk_releases
+from .timing import stage
+
+
+def check_url(url, fetcher, previous_versions, timings=None, known_releases=None):
+    """Return the status row {'url', 'name', 'version', 'date', 'flag'} for url.
+
+    With timings (a fortra_check.timing.Timings), the check's stages are timed.
+    With known_releases (product name -> set of versions in the release
+    history), a row whose version is not known yet also gets 'releases':
+    the page's releases newest first, down to the first known one.
+    """
+    with timings.measure(url) if timings is not None else nullcontext():
+        return check_timed(url, fetcher, previous_versions, known_releases)
+
+
+def check_timed(url, fetcher, previous_versions, known_releases=None):
+    try:
+        page_source, release = fetcher.fetch(url)
+        # Save page source for debugging, once per newly failing page
+        if release['version'] == NOT_FOUND and not fetcher.rules.missed_last_run(url):
+            dump_page_source(release['name'], page_source)
+
+        with stage('compare'):
+            flag = flag_for(release['version'], previous_versions.get(release['name']))
+        row = dict(url=url, **release, flag=flag)
+        if known_releases is not None and release['version'] != NOT_FOUND:
+            known = known_releases(release['name'])
+            # A known latest version means nothing new is listed; the page is not walked
+            if release['version'] not in known:
+                row['releases'] = (walk_releases(page_source, url, known, fetcher.parser, fetcher.rules)
+                                   or [{'version': release['version'], 'date': release['date']}])
+
+        # Debugging output
+        print(f"Processed {url}: Product={row['name']}, Version={row['version']}, Date={row['date']}, Flag={row['flag']}")
+        return row
+
+    except Exception as e:
+        # Handle any errors
+        print(f"Error processing {url}: {e}")
+        return {
+            'url': url,
+            'name': product_name_from_url(url),
+            'version': 'Error',
+            'date': str(e),
+            'flag': 'Error'
+        }
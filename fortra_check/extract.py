@@ -0,0 +1,123 @@
+"""Product name, version and release-date extraction from a release-note page."""
+import re
+from urllib.parse import urlparse
+
+from .parsers import get_parser
+from .rules import HeadingStrategy, default_rules
+from .timing import stage
+
+NOT_FOUND = "Not found"
+
+
+def product_name_from_url(url):
+    """Fallback product name: URL filename without extension."""
+    parsed_url = urlparse(url)
+    return parsed_url.path.split('/')[-1].rsplit('.', 1)[0].replace('forIBMi', ' for IBM i')
+
+
+def extract_release(page_source, url, parser=None, rules=None):
+    """Return {'name', 'version', 'date'} scraped from the page HTML.
+
+    parser is a Document class from fortra_check.parsers (default: fastest
+    installed); rules is a RuleRegistry (default: extract_rules.json).
+    """
+    rules = rules or default_rules()
+    with stage('parse'):
+        document = (parser or get_parser())(page_source, rules.tags_for(url))
+
+    # Extract product name from <h1> or URL
+    product_name = next((text.strip() for tag, text in document.nodes if tag == 'h1'), None)
+    if product_name is None:
+        product_name = product_name_from_url(url)
+
+    # Each strategy fills in whatever is still missing, until both are found
+    version = None
+    release_date = None
+    used = []
+    for strategy in rules.strategies_for(url):
+        with stage(strategy.stage):
+            found_version, found_date = strategy.apply(document)
+        if (version is None and found_version is not None) or (release_date is None and found_date is not None):
+            used.append(strategy.name)
+        if version is None:
+            version = found_version
+        if release_date is None:
+            release_date = found_date
+        if version is not None and release_date is not None:
+            break
+    rules.record(url, used if version is not None else [])
+
+    return {
+        'name': product_name,
+        'version': NOT_FOUND if version is None else version,
+        'date': NOT_FOUND if release_date is None else release_date,
+    }
+
+
+def walk_releases(page_source, url, known, parser=None, rules=None):
+    """Every release listed on the page, newest first, up to the first version in known.
+
+    Returns [{'version', 'date'}]. Only heading strategies list releases;
+    the walk uses the first of url's strategies that finds any.
+    """
+    rules = rules or default_rules()
+    with stage('parse'):
+        document = (parser or get_parser())(page_source, rules.tags_for(url))
+    for strategy in rules.strategies_for(url):
+        if not isinstance(strategy, HeadingStrategy):
+            continue
+        releases = []
+        with stage('history'):
+            for version, date in strategy.entries(document):
+                if version in known:
+                    return releases
+                releases.append({'version': version, 'date': NOT_FOUND if date is None else date})
+        if releases:
+            return releases
+    return []
+
+
+def dump_page_source(product_name, page_source):
+    """Save page source for debugging a failed version extraction."""
+    with open(f'page_source_{product_name.replace(" ", "_")}.html', 'w', encoding='utf-8') as f:
+        f.write(page_source)
+
+
+# Function to compare versions
+def compare_versions(current, previous):
+    if not current or not previous:
+        return "Invalid"
+    # For numeric versions (e.g., "8.13"), split and compare numerically
+    if re.match(r'^[\d.]+$', current) and re.match(r'^[\d.]+$', previous):
+        try:
+            curr_parts = [int(part) for part in current.split('.')]
+            prev_parts = [int(part) for part in previous.split('.')]
+            # Pad shorter list with zeros
+            max_len = max(len(curr_parts), len(prev_parts))
+            curr_parts += [0] * (max_len - len(curr_parts))
+            prev_parts += [0] * (max_len - len(prev_parts))
+            if curr_parts > prev_parts:
+                return "New"
+            elif curr_parts == prev_parts:
+                return "Same"
+            else:
+                return "Invalid"  # If current < previous, consider invalid
+        except (ValueError, IndexError):
+            return "Invalid"
+    # For alphanumeric versions (e.g., "R03M63"), compare as strings
+    else:
+        return "New" if current > previous else "Same" if current == previous else "Invalid"
+
+
+def is_valid_version(version):
+    return version not in (NOT_FOUND, 'Error')
+
+
+def flag_for(version, previous_version):
+    """Set flag based on comparison with previous version."""
+    if version not in [NOT_FOUND, "Error"] and previous_version:
+        return compare_versions(version, previous_version)
+    elif version not in [NOT_FOUND, "Error"]:
+        return "New"  # First time, consider new
+    else:
+        return "Invalid"
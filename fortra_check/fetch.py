@@ -0,0 +1,269 @@
+"""HTTP-first page fetching with Selenium as a fallback."""
+import codecs
+import sys
+import time
+from urllib.parse import urlparse
+
+import urllib3
+
+from . import settings
+from .cache import conditional_headers
+from .extract import NOT_FOUND, extract_release
+from .parsers import get_parser
+from .pool import DriverPool
+from .readiness import ReadyTimes, wait_until_ready
+from .resilience import (BudgetExceededError, CircuitBreaker, HTTPStatusError, backoff_delay,
+                         is_transient)
+from .rules import RuleRegistry
+from .state import load_json, merge_changes, update_json
+from .stream import stream_release
+from .timing import note, stage
+
+HTTP = "http"
+BROWSER = "browser"
+
+
+class Fetcher:
+    """Fetch release-note pages over pooled HTTP, escalating to a browser when needed.
+
+    Browsers are started from driver_factory (up to `browsers` of them) only
+    once a page's static HTML loads without a version. URLs where only the
+    browser found one are remembered in modes_file, so later runs skip the
+    pointless HTTP attempt for them. Browser pages are read as soon as the
+    release markup is present, and their ready times are kept in ready_times.
+
+    Static pages are revalidated against `cache` (a PageCache, or None to
+    always download); a 304 reuses the release extracted last time. Pages
+    that are downloaded or rendered again go through `memo` (an
+    ExtractionMemo, or None), which skips parsing when the content is
+    unchanged. `parser` names the fortra_check.parsers backend and `rules`
+    is the RuleRegistry used for extraction. With `stream`, static pages
+    are parsed as they arrive and the download stops once the latest
+    version and date are known.
+
+    Each page gets `page_timeout` seconds, cut short by `run_deadline` (a
+    time.monotonic() value, or None); `run_exhausted` becomes true once a
+    page is given up because the run deadline passed. Transient failures
+    are retried up to `retries` times with jittered backoff while the page
+    budget lasts, and a per-host CircuitBreaker fails pages fast once
+    several pages of their host have failed.
+    """
+
+    def __init__(self, driver_factory=None, browsers=1, modes_file=settings.FETCH_MODES_FILE, ready_times=None,
+                 cache=None, memo=None, parser='auto', rules=None, stream=False,
+                 page_timeout=settings.PAGE_TIMEOUT, retries=settings.RETRIES, breaker=None, run_deadline=None):
+        self.driver_factory = driver_factory
+        self.page_timeout = page_timeout
+        self.browsers = DriverPool(self.start_driver, browsers) if driver_factory else None
+        self.modes_file = modes_file
+        self.modes = load_json(modes_file)
+        self.changed_modes = {}  # Saved by merging into modes_file, which other processes share
+        self.ready_times = ready_times if ready_times is not None else ReadyTimes()
+        self.cache = cache
+        self.memo = memo
+        self.parser = get_parser(parser)
+        self.rules = rules if rules is not None else RuleRegistry.load()
+        self.stream = stream
+        self.retries = retries
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.run_deadline = run_deadline
+        self.run_exhausted = False
+        self.http = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=settings.HTTP_POOL_SIZE,
+            headers={'User-Agent': settings.USER_AGENT},
+            timeout=urllib3.Timeout(total=settings.HTTP_TIMEOUT),
+            # Only follow redirects here; failures are retried by fetch()
+            retries=urllib3.Retry(total=settings.MAX_REDIRECTS, connect=0, read=0, other=0),
+        )
+
+    def start_driver(self):
+        driver = self.driver_factory()
+        if hasattr(driver, 'set_page_load_timeout'):
+            driver.set_page_load_timeout(self.page_timeout)
+        return driver
+
+    def fetch(self, url):
+        """Return (page_source, release) for url, retrying transient failures within the page budget.
+
+        The host's circuit breaker counts the page once, as a single failure
+        when its retries are used up, so one failing page cannot open the
+        circuit for every other page on its host.
+        """
+        host = urlparse(url).netloc
+        deadline = time.monotonic() + self.page_timeout
+        if self.run_deadline is not None:
+            deadline = min(deadline, self.run_deadline)
+        self.breaker.before(host)
+        attempt = 0
+        try:
+            while True:
+                if time.monotonic() >= deadline:
+                    if self.run_deadline is not None and time.monotonic() >= self.run_deadline:
+                        self.run_exhausted = True
+                    raise BudgetExceededError("Latency budget exceeded")
+                try:
+                    result = self.fetch_once(url, deadline)
+                except Exception as e:
+                    delay = backoff_delay(attempt)
+                    if not is_transient(e) or attempt >= self.retries or time.monotonic() + delay >= deadline:
+                        raise
+                    attempt += 1
+                    print(f"Retrying {url} in {delay:.1f}s (attempt {attempt + 1}): {e}", file=sys.stderr)
+                    time.sleep(delay)
+                    continue
+                break
+        except Exception as e:
+            if is_transient(e) or (attempt and isinstance(e, BudgetExceededError)):
+                self.breaker.failure(host)
+            else:
+                self.breaker.release(host)
+            raise
+        self.breaker.success(host)
+        return result
+
+    def fetch_once(self, url, deadline=None):
+        """Return (page_source, release) for url using the cheapest working path."""
+        static = None
+        if self.modes.get(url) != BROWSER or self.driver_factory is None:
+            try:
+                page_source, release = self.fetch_static(url, deadline)
+                if release['version'] != NOT_FOUND:
+                    self.set_mode(url, HTTP)
+                    note(mode=HTTP)
+                    return page_source, release
+                static = (page_source, release)
+            except urllib3.exceptions.HTTPError as e:
+                if self.driver_factory is None:
+                    raise
+                print(f"HTTP fetch failed for {url} ({e}), falling back to browser", file=sys.stderr)
+            if self.driver_factory is None:
+                note(mode=HTTP)
+                return static
+
+        try:
+            page_source = self.fetch_browser(url, deadline)
+        except Exception as e:
+            if static is None:
+                raise
+            print(f"Browser fetch failed for {url} ({e}), using static HTML", file=sys.stderr)
+            note(mode=HTTP)
+            return static
+        release = self.extract(page_source, url)
+        if release['version'] == NOT_FOUND:
+            # The browser did not help either; try HTTP first again next time
+            self.set_mode(url, HTTP)
+        elif static is not None:
+            # Only a page whose static HTML loaded without a version needs the browser;
+            # after a transport error the mode is left as it was
+            self.set_mode(url, BROWSER)
+        note(mode=BROWSER)
+        return page_source, release
+
+    def set_mode(self, url, mode):
+        if self.modes.get(url) != mode:
+            self.modes[url] = self.changed_modes[url] = mode
+
+    def fetch_static(self, url, deadline=None):
+        """GET url with the pooled client and return (page_source, release).
+
+        A cached page is revalidated; on 304 Not Modified its stored body and
+        release are returned without parsing anything. A body cached by an
+        early-exit stream read is only revalidated when streaming again;
+        otherwise the whole page is downloaded and replaces it.
+        """
+        cached = self.cache.get(url) if self.cache is not None else None
+        if cached is not None and cached.get('partial') and not self.stream:
+            cached = None
+        timeout = settings.HTTP_TIMEOUT if deadline is None else min(settings.HTTP_TIMEOUT, remaining(deadline))
+        with stage('http'):
+            response = self.http.request('GET', url, headers=conditional_headers(cached), preload_content=False,
+                                         timeout=urllib3.Timeout(total=timeout))
+        try:
+            if response.status == 304 and cached is not None:
+                note(cache='not-modified')
+                return cached['body'], cached['release']
+            if response.status >= 400:
+                raise HTTPStatusError(response.status)
+
+            strategy = self.rules.stream_strategy(url) if self.stream else None
+            partial = False
+            if strategy is not None:
+                # Download and parsing are interleaved; their time counts as http
+                with stage('http'):
+                    page_source, release, partial = stream_release(response, url, response_charset(response), self.extract,
+                                                          strategy, self.rules)
+            else:
+                with stage('http'):
+                    body = response.read()
+                note(bytes=len(body))
+                page_source = body.decode(response_charset(response), errors='replace')
+                release = self.extract(page_source, url)
+        except BaseException:
+            response.close()  # Never hand a half-read connection back to the pool
+            raise
+        finally:
+            response.release_conn()
+
+        if self.cache is not None:
+            self.cache.put(url, response.headers, page_source, release, partial)
+        return page_source, release
+
+    def extract(self, page_source, url):
+        if self.memo is not None:
+            return self.memo.extract(page_source, url, self.parser, self.rules)
+        return extract_release(page_source, url, self.parser, self.rules)
+
+    def fetch_browser(self, url, deadline=None):
+        """Render url in a pooled Selenium driver (page loads are cut off at page_timeout)."""
+        if self.browsers is None:
+            raise RuntimeError("Page needs a browser but none is configured")
+        with self.browsers.driver() as driver:
+            with stage('navigate'):
+                driver.get(url)
+            # Wait for the release markup (JavaScript-rendered pages) instead of a fixed sleep
+            with stage('ready'):
+                timeout = self.ready_times.timeout_for(url)
+                if deadline is not None:
+                    timeout = min(timeout, remaining(deadline))
+                self.ready_times.record(url, wait_until_ready(driver, timeout, self.rules.strategies_for(url)))
+            with stage('page_source'):
+                page_source = driver.page_source
+            note(bytes=len(page_source.encode('utf-8')))
+            return page_source
+
+    def close(self):
+        """Quit any browsers that were started and persist the per-URL state."""
+        if self.browsers is not None:
+            self.browsers.close()
+        self.http.clear()
+        self.save()
+
+    def save(self):
+        """Persist the per-URL state; browsers and HTTP connections stay open."""
+        changes, self.changed_modes = self.changed_modes, {}
+        if changes:
+            modes = update_json(self.modes_file, lambda data: merge_changes(data, changes))
+            if modes is not None:
+                self.modes.update(modes)
+        self.ready_times.save()
+        self.rules.save()
+        if self.memo is not None:
+            self.memo.save()
+
+
+def remaining(deadline):
+    """Seconds left until deadline, never less than a small minimum so a last attempt can still be made."""
+    return max(0.5, deadline - time.monotonic())
+
+
+def response_charset(response):
+    content_type = response.headers.get('Content-Type', '')
+    for part in content_type.split(';'):
+        key, _, value = part.strip().partition('=')
+        if key.lower() == 'charset' and value:
+            try:
+                return codecs.lookup(value.strip('"')).name
+            except LookupError:
+                break
+    return 'utf-8'
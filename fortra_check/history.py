@@ -0,0 +1,242 @@
+"""Indexed SQLite version history.
+
+Every check is kept in `observations` (one row per run and URL) and the
+latest known good version of each product in `products`, so failed checks
+no longer make a product drop out of the history. `products` is updated
+when a run finishes, so an interrupted run does not move the versions
+the next run flags against. Both tables are written
+with upserts only. With --release-history, every release listed on a
+product's page is kept in `releases`, oldest first. On first use the
+existing previous_versions.json is imported.
+
+Query from the command line:
+    python -m fortra_check.history changed-since 2025-01-01
+    python -m fortra_check.history product "Robot Schedule"
+    python -m fortra_check.history releases "Robot Schedule"
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from . import settings
+from .extract import is_valid_version
+from .report import load_previous_versions
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS observations (
+    run_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    product TEXT NOT NULL,
+    version TEXT NOT NULL,
+    release_date TEXT,
+    flag TEXT,
+    observed_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, url)
+);
+CREATE INDEX IF NOT EXISTS observations_product ON observations (product, observed_at);
+CREATE INDEX IF NOT EXISTS observations_url ON observations (url, observed_at);
+CREATE TABLE IF NOT EXISTS products (
+    product TEXT PRIMARY KEY,
+    url TEXT,
+    version TEXT NOT NULL,
+    release_date TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    changed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS products_changed_at ON products (changed_at);
+CREATE TABLE IF NOT EXISTS releases (
+    product TEXT NOT NULL,
+    version TEXT NOT NULL,
+    release_date TEXT,
+    url TEXT,
+    first_seen TEXT NOT NULL,
+    PRIMARY KEY (product, version)
+);
+"""
+
+UPSERT_OBSERVATION = """
+INSERT INTO observations (run_id, url, product, version, release_date, flag, observed_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (run_id, url) DO UPDATE SET
+    product = excluded.product, version = excluded.version, release_date = excluded.release_date,
+    flag = excluded.flag, observed_at = excluded.observed_at
+"""
+
+# changed_at only moves when the version differs from the stored one
+UPSERT_PRODUCT = """
+INSERT INTO products (product, url, version, release_date, first_seen, last_seen, changed_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (product) DO UPDATE SET
+    changed_at = CASE WHEN products.version = excluded.version THEN products.changed_at ELSE excluded.changed_at END,
+    url = excluded.url, version = excluded.version, release_date = excluded.release_date,
+    last_seen = excluded.last_seen
+"""
+
+INSERT_RELEASE = """
+INSERT OR IGNORE INTO releases (product, version, release_date, url, first_seen)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+IMPORT_RUN_ID = 'import-previous-versions-json'
+
+
+def now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class HistoryStore:
+    """Thread-safe wrapper around the history database."""
+
+    def __init__(self, path=settings.HISTORY_DB):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def import_json(self, json_path):
+        """Seed products from previous_versions.json if the store has never seen a product."""
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM products LIMIT 1").fetchone():
+                return 0
+        versions = load_previous_versions(json_path)
+        if not versions:
+            return 0
+        seen_at = datetime.fromtimestamp(os.path.getmtime(json_path), timezone.utc).isoformat(timespec='seconds')
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO runs (run_id, started_at, finished_at) VALUES (?, ?, ?)",
+                              (IMPORT_RUN_ID, seen_at, seen_at))
+            for product, version in versions.items():
+                # The JSON has no URLs; the product name keeps observations unique
+                self.conn.execute(UPSERT_OBSERVATION, (IMPORT_RUN_ID, product, product, version, None, 'Imported', seen_at))
+                self.conn.execute(UPSERT_PRODUCT, (product, None, version, None, seen_at, seen_at, None))
+        print(f"Imported {len(versions)} products from {json_path} into {self.path}")
+        return len(versions)
+
+    def start_run(self):
+        run_id = uuid.uuid4().hex
+        with self.lock, self.conn:
+            self.conn.execute("INSERT INTO runs (run_id, started_at) VALUES (?, ?)", (run_id, now()))
+        return run_id
+
+    def finish_run(self, run_id):
+        """Mark run_id finished and move its good versions into products.
+
+        Products only change here, so an interrupted run that is never
+        resumed leaves the previous versions of the next run untouched.
+        """
+        with self.lock, self.conn:
+            # rowid order is the order the rows were recorded, i.e. URL-list order
+            rows = self.conn.execute("SELECT product, url, version, release_date, observed_at FROM observations "
+                                     "WHERE run_id = ? ORDER BY rowid", (run_id,)).fetchall()
+            self.conn.executemany(UPSERT_PRODUCT, [(product, url, version, release_date,
+                                                    observed_at, observed_at, observed_at)
+                                                   for product, url, version, release_date, observed_at in rows
+                                                   if is_valid_version(version)])
+            self.conn.execute("UPDATE runs SET finished_at = ? WHERE run_id = ?", (now(), run_id))
+
+    def record(self, run_id, row):
+        """Store one result row ({'url', 'name', 'version', 'date', 'flag'}, plus any new 'releases').
+
+        The product's latest version is updated by finish_run().
+        """
+        observed_at = now()
+        with self.lock, self.conn:
+            self.conn.execute(UPSERT_OBSERVATION, (run_id, row['url'], row['name'], row['version'], row['date'],
+                                                   row['flag'], observed_at))
+            # Listed newest first on the page; stored oldest first so rowid order is release order
+            self.conn.executemany(INSERT_RELEASE, [(row['name'], release['version'], release['date'], row['url'],
+                                                    observed_at) for release in reversed(row.get('releases') or [])])
+
+    def known_releases(self, product):
+        """Versions of product already in the release history."""
+        with self.lock:
+            return {version for (version,) in self.conn.execute(
+                "SELECT version FROM releases WHERE product = ?", (product,))}
+
+    def previous_versions(self):
+        """Latest known good version per product."""
+        with self.lock:
+            return dict(self.conn.execute("SELECT product, version FROM products ORDER BY rowid"))
+
+    def latest_releases(self):
+        """Latest known good release of each product as status rows (without a flag)."""
+        with self.lock:
+            return [{'url': url, 'name': product, 'version': version, 'date': release_date, 'flag': None}
+                    for product, url, version, release_date in self.conn.execute(
+                        "SELECT product, url, version, release_date FROM products ORDER BY rowid")]
+
+    def observations(self):
+        """Every checked observation as a status row plus observed_at, oldest first."""
+        with self.lock:
+            return [{'url': url, 'name': product, 'version': version, 'date': release_date, 'flag': flag,
+                     'observed_at': observed_at}
+                    for url, product, version, release_date, flag, observed_at in self.conn.execute(
+                        "SELECT url, product, version, release_date, flag, observed_at FROM observations "
+                        "WHERE run_id != ? ORDER BY observed_at", (IMPORT_RUN_ID,))]
+
+    def changed_since(self, since):
+        """Products whose version changed at or after `since` (ISO date or timestamp), newest first."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT product, version, release_date, changed_at FROM products "
+                "WHERE changed_at >= ? ORDER BY changed_at DESC", (since,)).fetchall()
+
+    def product_history(self, product):
+        """Every observation of a product, newest first."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT observed_at, version, release_date, flag, url FROM observations "
+                "WHERE product = ? ORDER BY observed_at DESC", (product,)).fetchall()
+
+    def product_releases(self, product):
+        """Every release of a product in the release history, newest first."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT version, release_date, first_seen FROM releases "
+                "WHERE product = ? ORDER BY rowid DESC", (product,)).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query the version history database.')
+    parser.add_argument('--db', default=settings.HISTORY_DB, help='History database (default: version_history.db)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    changed = commands.add_parser('changed-since', help='Products whose version changed since a date')
+    changed.add_argument('since', help='ISO date or timestamp, e.g. 2025-01-01')
+    product = commands.add_parser('product', help='All observations of one product')
+    product.add_argument('name')
+    releases = commands.add_parser('releases', help='Every release of one product (needs --release-history runs)')
+    releases.add_argument('name')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Error: {args.db} not found.", file=sys.stderr)
+        sys.exit(1)
+    store = HistoryStore(args.db)
+    if args.command == 'changed-since':
+        for name, version, release_date, changed_at in store.changed_since(args.since):
+            print(f"{name:<50}{version:<15}{release_date or '':<20}{changed_at}")
+    elif args.command == 'releases':
+        for version, release_date, first_seen in store.product_releases(args.name):
+            print(f"{version:<15}{release_date or '':<20}{first_seen}")
+    else:
+        for observed_at, version, release_date, flag, url in store.product_history(args.name):
+            print(f"{observed_at:<27}{version:<15}{release_date or '':<20}{flag or '':<10}{url}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
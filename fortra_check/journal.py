@@ -0,0 +1,74 @@
+"""Append-only journal of the current run, used by --resume.
+
+The first line records the run ID and the previous versions the run flags
+against; every following line is one finished row. Rows are appended and
+flushed as soon as a URL is done, in completion order. Error rows are not
+journaled, so a resumed run checks those URLs again. The journal is removed
+when a run completes.
+"""
+import json
+import os
+import sys
+import threading
+
+from . import settings
+
+
+class RunJournal:
+    def __init__(self, path=settings.JOURNAL_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = None
+
+    def load(self):
+        """Return (run_id, previous_versions, {url: row}) of an unfinished run, or None."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return None
+        try:
+            header = json.loads(lines[0])
+        except (IndexError, json.JSONDecodeError):
+            print(f"Warning: {self.path} has no valid header, starting a new run", file=sys.stderr)
+            return None
+        rows = {}
+        for line in lines[1:]:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Last line cut short by the interruption
+            rows[row['url']] = row
+        return header['run_id'], header['previous_versions'], rows
+
+    def start(self, run_id, previous_versions):
+        """Begin a new journal, discarding any unfinished one."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.file = open(self.path, 'w', encoding='utf-8')
+        self.write({'run_id': run_id, 'previous_versions': previous_versions})
+
+    def reopen(self):
+        """Keep appending to the journal of a resumed run."""
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            cut_short = f.read(1) != b'\n'
+        self.file = open(self.path, 'a', encoding='utf-8')
+        if cut_short:
+            self.file.write('\n')
+
+    def append(self, row):
+        if row['flag'] != 'Error':
+            self.write(row)
+
+    def write(self, record):
+        with self.lock:
+            self.file.write(json.dumps(record) + '\n')
+            self.file.flush()
+
+    def close(self, complete):
+        if self.file is not None:
+            self.file.close()
+        if complete:
+            os.remove(self.path)
+        else:
+            print(f"Run journal kept in {self.path}; continue with --resume")
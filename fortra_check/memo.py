@@ -0,0 +1,99 @@
+"""Content-hash memoization of extraction results across runs."""
+import hashlib
+import json
+import re
+import sys
+import threading
+from collections import OrderedDict
+
+from . import settings
+from .extract import extract_release
+from .rules import default_rules
+from .state import update_json
+from .timing import note
+
+# Bump when extract_release() changes so stale results are not reused
+MEMO_SCHEMA = 1
+
+# Scripts, styles and comments never reach get_text(), so they are dropped
+# before hashing; they are also where per-render noise (nonces, timestamps) lives.
+IGNORED_MARKUP = re.compile(r'<script\b.*?</script\s*>|<style\b.*?</style\s*>|<!--.*?-->', re.IGNORECASE | re.DOTALL)
+WHITESPACE = re.compile(r'\s+')
+
+
+def content_hash(page_source, url, rules_fingerprint=''):
+    """Hash of the normalized page source, the URL (used for the fallback name) and the rules in force."""
+    normalized = WHITESPACE.sub(' ', IGNORED_MARKUP.sub('', page_source)).strip()
+    digest = hashlib.sha256(url.encode('utf-8'))
+    digest.update(b'\0' + rules_fingerprint.encode('ascii') + b'\0')
+    digest.update(normalized.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ExtractionMemo:
+    """Bounded LRU map of content hash -> extracted release, persisted as JSON."""
+
+    def __init__(self, path=settings.MEMO_FILE, max_entries=settings.MEMO_SIZE):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.used = set()  # Keys looked up or added since the last save
+        self.lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: ignoring extraction memo {self.path} ({e})", file=sys.stderr)
+            return
+        if data.get('schema') != MEMO_SCHEMA:
+            return
+        for key, release in data.get('entries', []):
+            self.entries[key] = release
+
+    def extract(self, page_source, url, parser=None, rules=None):
+        """extract_release() that skips parsing when this exact content was seen before."""
+        rules = rules or default_rules()
+        key = content_hash(page_source, url, rules.fingerprint)
+        with self.lock:
+            release = self.entries.get(key)
+            if release is not None:
+                self.entries.move_to_end(key)
+                self.used.add(key)
+                note(cache='memo')
+                return dict(release)
+
+        release = extract_release(page_source, url, parser, rules)
+        with self.lock:
+            self.entries[key] = dict(release)
+            self.used.add(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)  # Evict least recently used
+        return release
+
+    def save(self):
+        """Merge the entries used since the last save into path as most recently used.
+
+        Other processes sharing the file keep their entries; only the
+        least recently used overall are evicted.
+        """
+        with self.lock:
+            used = [(key, release) for key, release in self.entries.items() if key in self.used]
+            self.used = set()
+        if not used:
+            return
+
+        def merge(data):
+            entries = OrderedDict(data.get('entries', []) if data.get('schema') == MEMO_SCHEMA else [])
+            for key, release in used:
+                entries.pop(key, None)
+                entries[key] = release
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            return {'schema': MEMO_SCHEMA, 'entries': list(entries.items())}
+
+        update_json(self.path, merge, indent=None)
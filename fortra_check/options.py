@@ -0,0 +1,89 @@
+"""Command-line options for the checker.
+
+Kept free of heavy imports so that --help stays fast.
+"""
+import argparse
+
+from . import settings
+from .drivers import BROWSERS
+from .parsers import PARSERS
+
+
+def build_parser(description, single_run=False, opens_report=True, run_budget=True):
+    """Options shared by the checker, watch mode and sharded runs.
+
+    single_run adds the options only a one-off run supports (--resume,
+    --discover, --timings, --metrics, --profile); opens_report adds --no-open
+    and run_budget adds --run-budget.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--browser', choices=BROWSERS, default='brave',
+                        help="Browser for pages that need JavaScript; 'http' never starts one (default: brave)")
+    parser.add_argument('--browser-path', help='Browser binary, if not installed in the default location')
+    parser.add_argument('--driver-path', help='WebDriver binary (default: the driver update_chromedriver.py '
+                                              'stored for the Brave/Chrome version, else webdriver-manager or '
+                                              'Selenium Manager)')
+    parser.add_argument('--urls-file', default=settings.URLS_FILE,
+                        help='Release-note URLs, one per line (default: fortra_releasenote_urls.txt)')
+    parser.add_argument('--previous-versions', default=settings.PREVIOUS_VERSIONS_FILE,
+                        help='Version JSON imported into the history database on first use and '
+                             'exported after each run (default: previous_versions.json)')
+    parser.add_argument('--history-db', default=settings.HISTORY_DB,
+                        help='SQLite version history (default: version_history.db)')
+    parser.add_argument('--output', default='release_status.txt',
+                        help='Fixed-width status report (default: release_status.txt)')
+    parser.add_argument('--release-history', action='store_true',
+                        help='Also record every release listed on each page in the version history, walking '
+                             'newest first down to the first release already recorded (turns off --stream)')
+    parser.add_argument('--scheduled', action='store_true',
+                        help="Only check URLs that are due given each product's release cadence")
+    parser.add_argument('--check-budget', type=int, metavar='N',
+                        help='With --scheduled, check at most N URLs per run, most likely changed first '
+                             '(URLs at the maximum staleness are always checked)')
+    parser.add_argument('--max-staleness', type=float, default=settings.MAX_STALENESS_DAYS, metavar='DAYS',
+                        help='With --scheduled, check every URL at least this often (default: 7)')
+    parser.add_argument('--csv', metavar='PATH', help='Also write the report as CSV, e.g. release_status.csv')
+    parser.add_argument('--jsonl', metavar='PATH', help='Also write the report as JSON Lines, one object per URL')
+    if opens_report:
+        parser.add_argument('--no-open', action='store_true', help='Do not open the report when done')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Maximum number of pages checked at once (default: 8, 1 = sequential)')
+    parser.add_argument('--per-host', type=int, default=4,
+                        help='Maximum concurrent requests to a single host (default: 4)')
+    parser.add_argument('--full-page-load', action='store_true',
+                        help='Load images, fonts, stylesheets and analytics and wait for the full page load '
+                             '(default: lean loading)')
+    parser.add_argument('--browsers', type=int, default=1,
+                        help='Size of the headless browser pool for pages that need JavaScript (default: 1)')
+    parser.add_argument('--page-timeout', type=float, default=settings.PAGE_TIMEOUT, metavar='SECONDS',
+                        help='Latency budget per page, retries included (default: 30)')
+    if run_budget:
+        parser.add_argument('--run-budget', type=float, metavar='SECONDS',
+                            help='Stop starting pages after this long; unchecked pages are reported as errors '
+                                 '(a single run picks them up with --resume)')
+    parser.add_argument('--retries', type=int, default=settings.RETRIES,
+                        help='Retries per page after timeouts, dropped connections or 5xx responses (default: 2)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Download and parse every page, bypassing the page cache and extraction memo')
+    parser.add_argument('--parser', choices=['auto'] + list(PARSERS), default='auto',
+                        help='HTML parser backend (default: auto = fastest installed of selectolax, lxml, html.parser)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Parse pages as they download and stop reading once the latest version and date are found')
+    if single_run:
+        parser.add_argument('--discover', action='store_true',
+                            help='While checking, crawl the _ProductPages index pages and append new product URLs '
+                                 'to the URL list (checked from the next run)')
+        parser.add_argument('--discover-depth', type=int, default=settings.DISCOVERY_DEPTH,
+                            help='Index levels followed below the seed pages (default: 2)')
+        parser.add_argument('--discover-budget', type=int, default=settings.DISCOVERY_BUDGET,
+                            help='Maximum index page requests per discovery (default: 30)')
+        parser.add_argument('--timings', metavar='PATH',
+                            help='Write per-URL stage timings, bytes fetched and cache status as JSON')
+        parser.add_argument('--metrics', metavar='PATH',
+                            help='Write the timings as a Prometheus textfile (node_exporter textfile collector)')
+        parser.add_argument('--profile', nargs='?', const='fortra_check.prof', metavar='PATH',
+                            help='Run under cProfile and tracemalloc, one URL at a time, and save the profile '
+                                 '(default: fortra_check.prof)')
+        parser.add_argument('--resume', action='store_true',
+                            help='Continue an interrupted run, skipping URLs it already checked')
+    return parser
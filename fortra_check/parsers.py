@@ -0,0 +1,110 @@
+"""Pluggable HTML parser backends for the extractor.
+
+Each backend turns a page into a Document: `nodes`, the requested heading
+tags (h1/h3/h5 by default) and p.release-date elements as (tag, text)
+pairs in document order, and
+`text()`, the visible page text used by the regex fallback. Only
+html.parser ships with beautifulsoup4; lxml and selectolax are optional
+(pip install lxml / pip install selectolax).
+"""
+from functools import lru_cache
+
+DEFAULT_TAGS = ('h1', 'h3', 'h5')
+RELEASE_DATE_CLASS = 'release-date'
+
+
+class SoupDocument:
+    """BeautifulSoup with a SoupStrainer, so only the target tags become a tree."""
+
+    name = 'html.parser'
+
+    def __init__(self, page_source, tags=DEFAULT_TAGS):
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        self.page_source = page_source
+        names = list(tags) + ['p']
+        soup = BeautifulSoup(page_source, 'html.parser', parse_only=SoupStrainer(names))
+        self.nodes = [
+            (tag.name, tag.text) for tag in soup.find_all(names)
+            if tag.name != 'p' or RELEASE_DATE_CLASS in tag.get('class', [])
+        ]
+
+    def text(self):
+        # The fallback needs every text node, so build the full tree only now
+        from bs4 import BeautifulSoup
+
+        return BeautifulSoup(self.page_source, 'html.parser').get_text()
+
+
+class LxmlDocument:
+    """lxml.html tree; text() reuses it after dropping scripts and styles."""
+
+    name = 'lxml'
+
+    def __init__(self, page_source, tags=DEFAULT_TAGS):
+        import lxml.html
+
+        self.root = None
+        self.nodes = []
+        if not page_source.strip():
+            return
+        # Parse bytes so pages with an <?xml encoding=...?> declaration are accepted
+        parser = lxml.html.HTMLParser(encoding='utf-8')
+        self.root = lxml.html.document_fromstring(page_source.encode('utf-8'), parser=parser)
+        self.nodes = [
+            (el.tag, el.text_content()) for el in self.root.iter(*tags, 'p')
+            if el.tag != 'p' or RELEASE_DATE_CLASS in (el.get('class') or '').split()
+        ]
+
+    def text(self):
+        if self.root is None:
+            return ''
+        for el in self.root.xpath('//script|//style'):
+            el.drop_tree()
+        return self.root.text_content()
+
+
+class SelectolaxDocument:
+    """selectolax (lexbor) tree queried with a single CSS selector."""
+
+    name = 'selectolax'
+
+    def __init__(self, page_source, tags=DEFAULT_TAGS):
+        from selectolax.lexbor import LexborHTMLParser
+
+        self.tree = LexborHTMLParser(page_source)
+        selector = ', '.join(list(tags) + [f'p.{RELEASE_DATE_CLASS}'])
+        self.nodes = [(node.tag, node.text()) for node in self.tree.css(selector)]
+
+    def text(self):
+        self.tree.strip_tags(['script', 'style'])
+        return self.tree.root.text() if self.tree.root is not None else ''
+
+
+PARSERS = {cls.name: cls for cls in (SoupDocument, LxmlDocument, SelectolaxDocument)}
+PREFERENCE = ('selectolax', 'lxml', 'html.parser')  # Fastest first for 'auto'
+
+
+@lru_cache(maxsize=None)
+def is_available(name):
+    module = {'html.parser': 'bs4', 'lxml': 'lxml.html', 'selectolax': 'selectolax.lexbor'}[name]
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def available_parsers():
+    return [name for name in PREFERENCE if is_available(name)]
+
+
+def get_parser(name='auto'):
+    """Return the Document class for name, or the fastest installed one for 'auto'."""
+    if name == 'auto':
+        return PARSERS[available_parsers()[0]]
+    if name not in PARSERS:
+        raise ValueError(f"Unknown parser {name!r} (choose from {', '.join(PARSERS)})")
+    if not is_available(name):
+        raise ValueError(f"Parser {name!r} is not installed")
+    return PARSERS[name]
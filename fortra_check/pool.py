@@ -0,0 +1,94 @@
+"""Pool of headless browser drivers shared by the crawl threads."""
+import sys
+import threading
+from contextlib import contextmanager
+
+
+class DriverPool:
+    """Up to `size` WebDriver sessions, started on demand from driver_factory.
+
+    Each session serves one page at a time. A session that raises while in
+    use is quit and replaced, and close() quits every session that was
+    started, so no browser processes outlive the run.
+    """
+
+    def __init__(self, driver_factory, size=1):
+        self.driver_factory = driver_factory
+        self.size = max(1, size)
+        self.drivers = []  # Every live session
+        self.idle = []  # Live sessions not checked out
+        self.starting = 0
+        self.error = None
+        self.closed = False
+        self.cond = threading.Condition()
+
+    @contextmanager
+    def driver(self):
+        """Check out a driver for the duration of the block."""
+        driver = self.acquire()
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, broken=True)
+            raise
+        self.release(driver)
+
+    def acquire(self):
+        with self.cond:
+            while True:
+                if self.closed:
+                    raise RuntimeError("Driver pool is closed")
+                if self.idle:
+                    return self.idle.pop()
+                if self.error is None and len(self.drivers) + self.starting < self.size:
+                    self.starting += 1
+                    break
+                if self.error is not None and not self.drivers and not self.starting:
+                    raise RuntimeError(f"Browser unavailable: {self.error}")
+                self.cond.wait()
+
+        # Start the browser outside the lock; it can take seconds
+        try:
+            driver = self.driver_factory()
+        except Exception as e:
+            with self.cond:
+                self.starting -= 1
+                self.error = e
+                self.cond.notify_all()
+            print(f"Failed to initialize browser driver: {e}", file=sys.stderr)
+            raise
+
+        with self.cond:
+            self.starting -= 1
+            if not self.closed:
+                self.drivers.append(driver)
+                return driver
+        quit_quietly(driver)
+        raise RuntimeError("Driver pool is closed")
+
+    def release(self, driver, broken=False):
+        with self.cond:
+            if broken or self.closed:
+                if driver in self.drivers:
+                    self.drivers.remove(driver)
+            else:
+                self.idle.append(driver)
+            self.cond.notify()
+        if broken or self.closed:
+            quit_quietly(driver)
+
+    def close(self):
+        """Quit every driver the pool started."""
+        with self.cond:
+            self.closed = True
+            drivers, self.drivers, self.idle = self.drivers, [], []
+            self.cond.notify_all()
+        for driver in drivers:
+            quit_quietly(driver)
+
+
+def quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"Error quitting browser driver: {e}", file=sys.stderr)
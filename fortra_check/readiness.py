@@ -0,0 +1,154 @@
+"""Wait for the release-note markup instead of sleeping a fixed time.
+
+A page is ready once one of its extraction strategies (from the
+fortra_check.rules registry) would find a version in the rendered DOM.
+Observed ready times are kept per URL in READY_TIMES_FILE. Run
+`python -m fortra_check.readiness` to print them.
+"""
+import sys
+import threading
+import time
+
+from . import settings
+from .rules import HeadingStrategy, TextStrategy
+from .state import load_json, merge_changes, update_json
+
+# True once a strategy in arguments[0] matches: ['heading', anchor, version_tag,
+# pattern] needs the first <version_tag> after the first <anchor> to match
+# pattern and a <p class="release-date"> after it, ['text', pattern] the
+# visible text. As in HeadingStrategy and TextStrategy, the captured version
+# must contain a digit. A pattern that is not valid JavaScript falls back to
+# a plain "version" test.
+READY_SCRIPT = r"""
+function compile(pattern) {
+    try { return new RegExp(pattern, 'i'); } catch (e) { return /version/i; }
+}
+function versionIn(text, pattern) {
+    var match = compile(pattern).exec(text);
+    return !!match && /\d/.test(match.length > 1 && match[1] !== undefined ? match[1] : match[0]);
+}
+var strategies = arguments[0];
+for (var i = 0; i < strategies.length; i++) {
+    var strategy = strategies[i];
+    if (strategy[0] === 'text') {
+        if (document.body && versionIn(document.body.innerText, strategy[1])) { return true; }
+        continue;
+    }
+    var anchor = document.querySelector(strategy[1]);
+    if (!anchor) { continue; }
+    var candidates = document.querySelectorAll(strategy[2]);
+    for (var j = 0; j < candidates.length; j++) {
+        if (anchor.compareDocumentPosition(candidates[j]) & Node.DOCUMENT_POSITION_FOLLOWING) {
+            if (!versionIn(candidates[j].textContent, strategy[3])) { break; }
+            var dates = document.querySelectorAll('p.release-date');
+            for (var k = 0; k < dates.length; k++) {
+                if (candidates[j].compareDocumentPosition(dates[k]) & Node.DOCUMENT_POSITION_FOLLOWING) { return true; }
+            }
+            break;
+        }
+    }
+}
+return false;
+"""
+
+MAX_SAMPLES = 10  # Ready times remembered per URL
+MIN_TIMEOUT = 2.0  # Never wait less than this for a page seen before
+TIMEOUT_FACTOR = 3  # Tuned timeout = slowest observed ready time x this
+TIMEOUT_STREAK = 3  # Consecutive timeouts after which a page is taken to never match
+NEVER_READY_TIMEOUT = 5.0  # Wait for such pages, as the fixed sleep before ready detection did
+
+
+def ready_strategies(strategies):
+    """READY_SCRIPT's argument for a URL's extraction strategies."""
+    specs = []
+    for strategy in strategies:
+        if isinstance(strategy, HeadingStrategy):
+            specs.append(['heading', strategy.anchor, strategy.version_tag, strategy.version_re.pattern])
+        elif isinstance(strategy, TextStrategy) and strategy.version_re is not None:
+            specs.append(['text', strategy.version_re.pattern])
+    return specs
+
+
+class ReadyTimes:
+    """Per-URL record of how long pages took to become ready."""
+
+    def __init__(self, path=settings.READY_TIMES_FILE, hard_timeout=settings.READY_TIMEOUT):
+        self.path = path
+        self.hard_timeout = hard_timeout
+        self.samples = load_json(path)
+        self.changed = set()
+        self.lock = threading.Lock()
+
+    def timeout_for(self, url):
+        """How long to wait for url, learnt from its recent ready times and timeouts.
+
+        Unknown URLs get the hard timeout, and so do URLs that timed out
+        without ever becoming ready, until TIMEOUT_STREAK timeouts in a row
+        show that waiting does not help; those get NEVER_READY_TIMEOUT.
+        Otherwise the timeout is a margin over the slowest observed ready
+        time, doubled right after a timeout.
+        """
+        history = self.samples.get(url, [])
+        if not history:
+            return self.hard_timeout
+        if len(history) >= TIMEOUT_STREAK and all(s is None for s in history[-TIMEOUT_STREAK:]):
+            return min(self.hard_timeout, NEVER_READY_TIMEOUT)
+        observed = [s for s in history if s is not None]
+        if not observed:
+            return self.hard_timeout
+        timeout = max(MIN_TIMEOUT, TIMEOUT_FACTOR * max(observed))
+        if history[-1] is None:
+            timeout *= 2
+        return min(self.hard_timeout, timeout)
+
+    def record(self, url, seconds):
+        """Record a ready time; None means the page timed out."""
+        with self.lock:
+            history = self.samples.setdefault(url, [])
+            history.append(None if seconds is None else round(seconds, 3))
+            del history[:-MAX_SAMPLES]
+            self.changed.add(url)
+
+    def save(self):
+        """Merge the URLs recorded since the last save into path, keeping other processes' URLs."""
+        with self.lock:
+            changes = {url: list(self.samples[url]) for url in self.changed}
+            self.changed = set()
+        if changes:
+            update_json(self.path, lambda data: merge_changes(data, changes))
+
+
+def wait_until_ready(driver, timeout, strategies):
+    """Block until one of strategies matches (see READY_SCRIPT) or timeout expires; return elapsed seconds or None."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    specs = ready_strategies(strategies)
+    start = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(lambda d: d.execute_script(READY_SCRIPT, specs))
+    except TimeoutException:
+        return None
+    return time.monotonic() - start
+
+
+def report(samples, out=sys.stdout):
+    """Print per-URL ready times, slowest first."""
+    rows = []
+    for url, history in samples.items():
+        observed = [s for s in history if s is not None]
+        timeouts = len(history) - len(observed)
+        slowest = max(observed) if observed else None
+        rows.append((slowest if slowest is not None else float('inf'), url, observed, timeouts))
+    rows.sort(reverse=True)
+
+    out.write(f"{'Slowest':<10}{'Median':<10}{'Timeouts':<10}URL\n")
+    for slowest, url, observed, timeouts in rows:
+        median = sorted(observed)[len(observed) // 2] if observed else None
+        slowest_text = f"{slowest:.2f}" if observed else '-'
+        median_text = f"{median:.2f}" if median is not None else '-'
+        out.write(f"{slowest_text:<10}{median_text:<10}{timeouts:<10}{url}\n")
+
+
+if __name__ == "__main__":
+    report(load_json(settings.READY_TIMES_FILE))
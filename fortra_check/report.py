@@ -0,0 +1,134 @@
+"""Writing the run results: version history and the release status reports."""
+import csv
+import json
+import os
+import subprocess
+import sys
+
+
+def load_previous_versions(path):
+    """Load previous versions if the JSON file exists."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except json.JSONDecodeError as e:
+        print(f"Warning: {path} is not valid JSON ({e})")
+        return {}
+
+
+def write_previous_versions(path, versions):
+    """Export the latest known version of each product to previous_versions.json."""
+    try:
+        with open(path, 'w') as f:
+            json.dump(versions, f, indent=4)
+        print(f"Updated previous versions in {path}")
+    except Exception as e:
+        print(f"Error updating previous versions: {e}")
+
+
+COLUMNS = (('Product', 'name', 50), ('Version', 'version', 15), ('Date', 'date', 20), ('Flag', 'flag', 10))
+
+
+class AtomicWriter:
+    """Write a report row by row to <path>.partial and rename it over path on commit().
+
+    Readers of path only ever see the previous complete report or the new
+    one. Each row is flushed as it is written, so if the run dies the rows
+    checked so far are left in the .partial file.
+    """
+
+    def __init__(self, path, newline=None):
+        self.path = path
+        self.partial_path = path + '.partial'
+        self.file = open(self.partial_path, 'w', newline=newline, encoding='utf-8')
+        self.write_header()
+
+    def write_header(self):
+        pass
+
+    def write_row(self, row):
+        raise NotImplementedError
+
+    def write(self, row):
+        self.write_row(row)
+        self.file.flush()
+
+    def commit(self):
+        self.file.close()
+        os.replace(self.partial_path, self.path)
+        print(f"Output written to {self.path}")
+
+    def abort(self):
+        self.file.close()
+        print(f"Partial output left in {self.partial_path}")
+
+
+class TextWriter(AtomicWriter):
+    """release_status.txt with fixed-width columns."""
+
+    def write_header(self):
+        self.file.write(''.join(f"{title:<{width}}" for title, _, width in COLUMNS) + '\n')
+
+    def write_row(self, row):
+        self.file.write(''.join(f"{row[key]:<{width}}" for _, key, width in COLUMNS) + '\n')
+
+
+class CsvWriter(AtomicWriter):
+    """Excel-compatible CSV with the same columns as the text report."""
+
+    def __init__(self, path):
+        super().__init__(path, newline='')
+
+    def write_header(self):
+        self.csv = csv.writer(self.file)
+        self.csv.writerow([title for title, _, _ in COLUMNS])
+
+    def write_row(self, row):
+        self.csv.writerow([row[key] for _, key, _ in COLUMNS])
+
+
+class JsonlWriter(AtomicWriter):
+    """One JSON object per row, including the URL."""
+
+    def write_row(self, row):
+        self.file.write(json.dumps(row) + '\n')
+
+
+class ReportWriters:
+    """Fan each result row out to every configured report as it is produced."""
+
+    def __init__(self, output, csv_path=None, jsonl_path=None):
+        self.writers = [TextWriter(output)]
+        if csv_path:
+            self.writers.append(CsvWriter(csv_path))
+        if jsonl_path:
+            self.writers.append(JsonlWriter(jsonl_path))
+
+    def write(self, row):
+        for writer in self.writers:
+            writer.write(row)
+
+    def close(self, complete=True):
+        """Publish the reports if the run completed, else keep the .partial files; returns complete."""
+        for writer in self.writers:
+            try:
+                writer.commit() if complete else writer.abort()
+            except OSError as e:
+                print(f"Error writing to output file: {e}")
+                complete = False
+        return complete
+
+
+def open_file(path):
+    """Open path with the default application (TextEdit, Notepad, xdg-open)."""
+    try:
+        if sys.platform == 'darwin':
+            subprocess.run(['open', path], check=False)
+        elif sys.platform == 'win32':
+            os.startfile(path)
+        else:
+            subprocess.run(['xdg-open', path], check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError as e:
+        print(f"Could not open {path}: {e}")
@@ -0,0 +1,88 @@
+"""Retries with jittered backoff and a per-host circuit breaker for page fetches."""
+import random
+import threading
+import time
+
+import urllib3
+
+from . import settings
+
+
+class HTTPStatusError(urllib3.exceptions.HTTPError):
+    """A page answered with an error status."""
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+class CircuitOpenError(Exception):
+    """The host failed repeatedly and is not tried until its cooldown has passed."""
+
+
+class BudgetExceededError(Exception):
+    """The page or run latency budget ran out."""
+
+
+def is_transient(error):
+    """True for failures worth retrying: timeouts, dropped connections, 5xx / 429 and browser errors."""
+    if isinstance(error, HTTPStatusError):
+        return error.status >= 500 or error.status == 429
+    if isinstance(error, urllib3.exceptions.HTTPError):
+        return True
+    # Selenium is only imported once a browser starts; match its exceptions by module
+    return type(error).__module__.startswith('selenium.')
+
+
+def backoff_delay(attempt, base=settings.RETRY_BACKOFF, cap=settings.RETRY_BACKOFF_MAX):
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Per-host breaker: opens after `threshold` consecutive transient failures.
+
+    A call is one page, retries included: Fetcher.fetch() calls before()
+    once per page and failure() only when the page's retries are used up.
+    While open, calls for the host fail at once with CircuitOpenError. After
+    `cooldown` seconds a single trial call is let through; its success closes
+    the breaker, its failure opens it for another cooldown.
+    """
+
+    def __init__(self, threshold=settings.BREAKER_THRESHOLD, cooldown=settings.BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.failures = {}
+        self.opened_at = {}
+        self.trial = set()  # Hosts with a trial call in flight
+
+    def before(self, host):
+        """Raise CircuitOpenError if host may not be called now."""
+        with self.lock:
+            opened_at = self.opened_at.get(host)
+            if opened_at is None:
+                return
+            if time.monotonic() - opened_at < self.cooldown or host in self.trial:
+                raise CircuitOpenError(f"{host} is failing; skipped for up to {self.cooldown:.0f}s")
+            self.trial.add(host)
+
+    def success(self, host):
+        with self.lock:
+            self.failures.pop(host, None)
+            self.opened_at.pop(host, None)
+            self.trial.discard(host)
+
+    def failure(self, host):
+        with self.lock:
+            self.failures[host] = self.failures.get(host, 0) + 1
+            if host in self.trial or self.failures[host] >= self.threshold:
+                if host not in self.opened_at or host in self.trial:
+                    print(f"Circuit opened for {host} after {self.failures[host]} failures")
+                self.opened_at[host] = time.monotonic()
+            self.trial.discard(host)
+
+    def release(self, host):
+        """End a trial call that neither succeeded nor failed transiently."""
+        with self.lock:
+            self.trial.discard(host)
@@ -0,0 +1,234 @@
+"""Declarative extraction rules: URL patterns mapped to extraction strategies.
+
+Rules are read once per run from RULES_FILE (extract_rules.json) and every
+pattern is compiled up front. Each strategy fills in whichever of version
+and date are still missing; strategies run cheapest first, except that the
+strategies that produced a URL's result last run are tried first, so pages
+that always need the page-text fallback go straight to it.
+"""
+import fnmatch
+import hashlib
+import json
+import re
+import sys
+import threading
+
+from . import settings
+from .state import load_json, merge_changes, update_json
+
+MONTH_DATE = r'(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}'
+
+# Used when RULES_FILE does not exist; matches the shipped extract_rules.json
+DEFAULT_CONFIG = {
+    "strategies": {
+        "release_heading": {
+            "type": "heading",
+            "cost": 1,
+            "anchor": "h3",
+            "version_tag": "h5",
+            "version_pattern": r"Version\s*:?\s*([\w\d.]+)",
+        },
+        "page_text": {
+            "type": "text",
+            "cost": 10,
+            "version_pattern": r"Version\s*:?\s*([\w\d.]+[\d][\w\d.]*)",
+            "date_pattern": MONTH_DATE,
+        },
+    },
+    "rules": [
+        {"match": "*", "strategies": ["release_heading", "page_text"]},
+    ],
+}
+
+DIGIT_RE = re.compile(r'\d')
+HEADING_TAGS = ('h2', 'h3', 'h4', 'h5', 'h6')
+
+
+class HeadingStrategy:
+    """Version from the first <version_tag> after the first <anchor>; date from the next p.release-date."""
+
+    stage = 'extract'  # fortra_check.timing stage
+
+    def __init__(self, name, cost=1, anchor='h3', version_tag='h5', version_pattern=r'Version\s*:?\s*([\w\d.]+)'):
+        if anchor not in HEADING_TAGS or version_tag not in HEADING_TAGS:
+            raise ValueError(f"Strategy {name!r}: anchor and version_tag must be one of {', '.join(HEADING_TAGS)}")
+        self.name = name
+        self.cost = cost
+        self.anchor = anchor
+        self.version_tag = version_tag
+        self.version_re = re.compile(version_pattern, re.IGNORECASE)
+        self.tags = (anchor, version_tag)
+
+    def apply(self, document):
+        """Return (version, date); either may be None."""
+        nodes = document.nodes
+        anchor = next((i for i, (tag, _) in enumerate(nodes) if tag == self.anchor), None)
+        if anchor is None:
+            return None, None
+        version_node = next((i for i in range(anchor + 1, len(nodes)) if nodes[i][0] == self.version_tag), None)
+        if version_node is None:
+            return None, None
+        version_match = self.version_re.search(nodes[version_node][1].strip())
+        if not version_match:
+            return None, None
+        # Verify version format (must contain at least one digit)
+        version = version_match.group(1) if DIGIT_RE.search(version_match.group(1)) else None
+        date = next((text.strip() for tag, text in nodes[version_node + 1:] if tag == 'p'), None)
+        return version, date
+
+    def entries(self, document):
+        """Yield (version, date) for every <version_tag> after the first <anchor>, in page order (newest first).
+
+        The date is the p.release-date before the next <version_tag>, or None.
+        """
+        nodes = document.nodes
+        anchor = next((i for i, (tag, _) in enumerate(nodes) if tag == self.anchor), None)
+        if anchor is None:
+            return
+        version = None
+        for tag, text in nodes[anchor + 1:]:
+            if tag == self.version_tag:
+                if version is not None:
+                    yield version, None
+                version_match = self.version_re.search(text.strip())
+                version = version_match.group(1) if version_match and DIGIT_RE.search(version_match.group(1)) else None
+            elif tag == 'p' and version is not None:
+                yield version, text.strip()
+                version = None
+        if version is not None:
+            yield version, None
+
+
+class TextStrategy:
+    """Regex search over the visible page text."""
+
+    stage = 'fallback'
+
+    def __init__(self, name, cost=10, version_pattern=None, date_pattern=None):
+        self.name = name
+        self.cost = cost
+        self.version_re = re.compile(version_pattern, re.IGNORECASE) if version_pattern else None
+        self.date_re = re.compile(date_pattern, re.IGNORECASE) if date_pattern else None
+        self.tags = ()
+
+    def apply(self, document):
+        page_text = document.text()
+        version = date = None
+        if self.version_re is not None:
+            version_match = self.version_re.search(page_text)
+            if version_match and DIGIT_RE.search(version_match.group(1)):
+                version = version_match.group(1)
+        if self.date_re is not None:
+            date_match = self.date_re.search(page_text)
+            if date_match:
+                date = date_match.group(0)
+        return version, date
+
+
+STRATEGY_TYPES = {'heading': HeadingStrategy, 'text': TextStrategy}
+
+
+def compile_pattern(pattern):
+    """Glob over the full URL; patterns without a scheme or leading * match any prefix."""
+    if not pattern.startswith(('*', 'http://', 'https://')):
+        pattern = '*/' + pattern
+    return re.compile(fnmatch.translate(pattern))
+
+
+class RuleRegistry:
+    """Compiled rules plus the per-URL record of which strategies worked."""
+
+    def __init__(self, config, hits_file=settings.STRATEGY_HITS_FILE):
+        self.fingerprint = hashlib.sha1(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+        self.strategies = {}
+        for name, spec in config.get('strategies', {}).items():
+            spec = dict(spec)
+            kind = spec.pop('type', None)
+            if kind not in STRATEGY_TYPES:
+                raise ValueError(f"Strategy {name!r}: unknown type {kind!r}")
+            self.strategies[name] = STRATEGY_TYPES[kind](name, **spec)
+
+        self.rules = []
+        for rule in config.get('rules', []):
+            missing = [name for name in rule['strategies'] if name not in self.strategies]
+            if missing:
+                raise ValueError(f"Rule {rule['match']!r}: unknown strategies {', '.join(missing)}")
+            chain = sorted((self.strategies[name] for name in rule['strategies']), key=lambda s: s.cost)
+            self.rules.append((compile_pattern(rule['match']), chain))
+
+        self.hits_file = hits_file
+        self.hits = load_json(hits_file) if hits_file else {}
+        self.previous_hits = dict(self.hits)
+        self.changed = set()
+        self.lock = threading.Lock()
+        self.resolved = {}
+
+    @classmethod
+    def load(cls, path=settings.RULES_FILE, hits_file=settings.STRATEGY_HITS_FILE):
+        try:
+            with open(path, 'r') as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            config = DEFAULT_CONFIG
+        except json.JSONDecodeError as e:
+            print(f"Warning: {path} is not valid JSON ({e}); using built-in rules", file=sys.stderr)
+            config = DEFAULT_CONFIG
+        return cls(config, hits_file)
+
+    def chain_for(self, url):
+        """Strategies for url, cheapest first (first matching rule wins)."""
+        chain = self.resolved.get(url)
+        if chain is None:
+            chain = next((chain for pattern, chain in self.rules if pattern.match(url)), [])
+            self.resolved[url] = chain
+        return chain
+
+    def strategies_for(self, url):
+        """chain_for(url) with the strategies that worked last time moved to the front."""
+        chain = self.chain_for(url)
+        last = self.hits.get(url)
+        if not last:
+            return chain
+        return [s for s in chain if s.name in last] + [s for s in chain if s.name not in last]
+
+    def tags_for(self, url):
+        tags = {'h1'}
+        for strategy in self.chain_for(url):
+            tags.update(strategy.tags)
+        return tuple(sorted(tags))
+
+    def stream_strategy(self, url):
+        """The heading strategy the streaming extractor can run for url, if it is tried first."""
+        chain = self.strategies_for(url)
+        if chain and isinstance(chain[0], HeadingStrategy):
+            return chain[0]
+        return None
+
+    def record(self, url, used):
+        """Remember the strategy names that produced url's result ([] = nothing found)."""
+        with self.lock:
+            self.hits[url] = list(used)
+            self.changed.add(url)
+
+    def missed_last_run(self, url):
+        return self.previous_hits.get(url) == []
+
+    def save(self):
+        """Merge the URLs recorded since the last save into hits_file; they become the last run for missed_last_run()."""
+        with self.lock:
+            changes = {url: self.hits[url] for url in self.changed}
+            self.changed = set()
+            self.previous_hits = dict(self.hits)
+        if self.hits_file and changes:
+            update_json(self.hits_file, lambda data: merge_changes(data, changes))
+
+
+_default_rules = None
+
+
+def default_rules():
+    """Rules from RULES_FILE, loaded once per process."""
+    global _default_rules
+    if _default_rules is None:
+        _default_rules = RuleRegistry.load()
+    return _default_rules
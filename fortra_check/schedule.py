@@ -0,0 +1,156 @@
+"""Cadence-aware choice of which URLs to check in a run.
+
+Each URL's release cadence is learnt from the release dates recorded in
+the version history (the median gap between distinct dates). A URL is
+checked again after a quarter of its cadence, and as often as possible once
+its next release is overdue. Products with a single known release are
+checked after a quarter of the time since that release, so dormant ones
+drift towards the maximum staleness. Every URL is checked at least once
+per max_staleness, whatever the budget. Only successful checks count: a
+URL whose last check failed (Error / Not found) is checked again next run.
+
+    python -m fortra_check.schedule   # Print the plan for the next run
+"""
+import statistics
+from datetime import datetime, timedelta, timezone
+
+from . import settings
+from .extract import is_valid_version
+
+DATE_FORMATS = ('%B %d, %Y', '%b %d, %Y', '%B %Y', '%b %Y', '%Y-%m-%d', '%m/%d/%Y')
+SKIPPED = 'Skipped'
+
+
+def parse_release_date(text):
+    """Parse dates as they appear on release-note pages ("August 1, 2025", "June 2020")."""
+    if not text:
+        return None
+    text = ' '.join(text.replace('Sept ', 'Sep ').split())
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def release_cadence(release_dates):
+    """Median gap between distinct release dates, or None with fewer than two."""
+    release_dates = sorted(set(release_dates))
+    if len(release_dates) < 2:
+        return None
+    return timedelta(days=statistics.median((b - a).days for a, b in zip(release_dates, release_dates[1:])))
+
+
+def check_interval(release_dates, today, min_interval, max_staleness):
+    """How long a URL with these known release dates may go unchecked."""
+    if not release_dates:
+        return min_interval  # Nothing learnt yet
+    since_release = timedelta(days=(today - max(release_dates)).days)
+    cadence = release_cadence(release_dates)
+    if cadence is None:
+        interval = since_release / 4
+    elif since_release >= cadence:
+        interval = min_interval  # Next release is due
+    else:
+        interval = cadence / 4
+    return max(min_interval, min(interval, max_staleness))
+
+
+class UrlPlan:
+    def __init__(self, url, last_row, last_checked, interval, elapsed, max_staleness, failed=False):
+        self.url = url
+        self.last_row = last_row
+        self.last_checked = last_checked
+        self.interval = interval
+        self.elapsed = elapsed
+        self.failed = failed  # The latest check came back without a version
+        self.stale = failed or elapsed is None or elapsed >= max_staleness
+
+    @property
+    def priority(self):
+        """Fraction of its interval the URL has gone unchecked (>= 1 means due)."""
+        if self.elapsed is None:
+            return float('inf')
+        return self.elapsed / self.interval
+
+    def skipped_row(self):
+        """The last observed row, reported for a URL that is not checked this run."""
+        return dict(self.last_row, flag=SKIPPED)
+
+
+def plan(urls, observations, budget=None, now=None,
+         min_interval=timedelta(days=settings.MIN_CHECK_INTERVAL_DAYS),
+         max_staleness=timedelta(days=settings.MAX_STALENESS_DAYS)):
+    """Split urls into (to_check, skipped) UrlPlans.
+
+    observations are HistoryStore.observations() rows in time order. Stale
+    URLs (never checked successfully, unchecked for max_staleness, or
+    failed last time) are always checked; the rest of the budget (None = no limit) goes to the due URLs
+    that are furthest past their interval.
+    """
+    now = now or datetime.now(timezone.utc)
+    seen = {}
+    for row in observations:
+        entry = seen.setdefault(row['url'], {'dates': set(), 'last': None, 'failed': False})
+        # Failed checks tell nothing about the release; they only make the URL due again
+        entry['failed'] = not is_valid_version(row['version'])
+        if entry['failed']:
+            continue
+        release_date = parse_release_date(row['date'])
+        if release_date is not None:
+            entry['dates'].add(release_date)
+        entry['last'] = row
+
+    plans = []
+    for url in urls:
+        entry = seen.get(url)
+        if entry is None or entry['last'] is None:
+            plans.append(UrlPlan(url, None, None, min_interval, None, max_staleness))
+            continue
+        last_checked = datetime.fromisoformat(entry['last']['observed_at'])
+        interval = check_interval(entry['dates'], now.date(), min_interval, max_staleness)
+        last_row = {key: entry['last'][key] for key in ('url', 'name', 'version', 'date')}
+        plans.append(UrlPlan(url, last_row, last_checked, interval, now - last_checked, max_staleness,
+                             entry['failed']))
+
+    stale = [p for p in plans if p.stale]
+    due = sorted((p for p in plans if not p.stale and p.priority >= 1), key=lambda p: p.priority, reverse=True)
+    if budget is not None:
+        if len(stale) > budget:
+            print(f"Warning: {len(stale)} URLs exceed the maximum staleness; checking all of them "
+                  f"despite the budget of {budget}")
+        due = due[:max(0, budget - len(stale))]
+    chosen = {p.url for p in stale + due}
+    return [p for p in plans if p.url in chosen], [p for p in plans if p.url not in chosen]
+
+
+def skipped_rows(urls, history, args):
+    """Plan a run from the command-line options; returns {url: skipped_row()} for URLs not due."""
+    to_check, not_due = plan(urls, history.observations(), args.check_budget,
+                             max_staleness=timedelta(days=args.max_staleness))
+    print(f"Scheduled: checking {len(to_check)} of {len(urls)} URLs")
+    return {p.url: p.skipped_row() for p in not_due}
+
+
+def report(plans, skipped):
+    for label, group in (('check', plans), ('skip', skipped)):
+        for p in group:
+            last = p.last_checked.isoformat(timespec='minutes') if p.last_checked else 'never'
+            print(f"{label:<6}{p.url:<100}{last:<28}every {p.interval.total_seconds() / 86400:.1f} days")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .cli import load_urls
+    from .history import HistoryStore
+
+    parser = argparse.ArgumentParser(description='Show which URLs the next scheduled run would check.')
+    parser.add_argument('--urls-file', default=settings.URLS_FILE)
+    parser.add_argument('--history-db', default=settings.HISTORY_DB)
+    parser.add_argument('--check-budget', type=int)
+    args = parser.parse_args()
+    store = HistoryStore(args.history_db)
+    report(*plan(load_urls(args.urls_file), store.observations(), args.check_budget))
+    store.close()
@@ -0,0 +1,43 @@
+"""Paths and defaults shared by the checker scripts."""
+import os
+
+# Configuration
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE_DIR = os.path.join(BASE_DIR, '.fortra_cache')
+URLS_FILE = os.path.join(BASE_DIR, 'fortra_releasenote_urls.txt')
+RULES_FILE = os.path.join(BASE_DIR, 'extract_rules.json')
+PREVIOUS_VERSIONS_FILE = os.path.join(BASE_DIR, 'previous_versions.json')
+HISTORY_DB = os.path.join(BASE_DIR, 'version_history.db')
+FETCH_MODES_FILE = os.path.join(STATE_DIR, 'fetch_modes.json')
+READY_TIMES_FILE = os.path.join(STATE_DIR, 'ready_times.json')
+PAGE_CACHE_DIR = os.path.join(STATE_DIR, 'pages')
+MEMO_FILE = os.path.join(STATE_DIR, 'extract_memo.json')
+STRATEGY_HITS_FILE = os.path.join(STATE_DIR, 'strategy_hits.json')
+JOURNAL_FILE = os.path.join(STATE_DIR, 'run_journal.jsonl')
+DISCOVERY_FILE = os.path.join(STATE_DIR, 'discovery.json')
+SHARD_QUEUE_FILE = os.path.join(STATE_DIR, 'shard_queue.db')
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36'
+HTTP_TIMEOUT = 15  # Seconds per plain HTTP request
+MAX_REDIRECTS = 5
+HTTP_POOL_SIZE = 8  # Keep-alive connections kept per host
+STREAM_CHUNK_SIZE = 8192  # Bytes read per step by the early-exit extractor
+MEMO_SIZE = 2048  # Extraction results kept in the content-hash memo
+READY_TIMEOUT = 10  # Hard limit in seconds on waiting for a rendered page's release markup
+PAGE_TIMEOUT = 30  # Latency budget in seconds per page, retries included
+RETRIES = 2  # Retries per page after a transient failure
+RETRY_BACKOFF = 0.5  # Base of the jittered exponential backoff, in seconds
+RETRY_BACKOFF_MAX = 8
+BREAKER_THRESHOLD = 3  # Consecutive failed pages (retries used up) before a host's circuit opens
+BREAKER_COOLDOWN = 60  # Seconds before an open circuit lets a trial request through
+MIN_CHECK_INTERVAL_DAYS = 0.5  # Scheduled runs never re-check a URL sooner than this
+MAX_STALENESS_DAYS = 7  # Scheduled runs check every URL at least this often
+# Index pages product discovery starts from
+DISCOVERY_SEEDS = ('https://hstechdocs.helpsystems.com/releasenotes/Content/_ProductPages/',)
+DISCOVERY_DEPTH = 2  # Index levels followed below the seeds
+DISCOVERY_BUDGET = 30  # Index page requests per discovery
+WATCH_INTERVAL = 3600  # Seconds between checks in watch mode
+WATCH_PORT = 8787  # Local status API of watch mode
+SHARD_SIZE = 8  # URLs leased to a worker at a time in sharded runs
+SHARD_LEASE = 300  # Seconds a leased shard stays with a worker that stops reporting
+SHARD_WORKERS = 4  # Worker processes started by a local sharded run
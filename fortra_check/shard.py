@@ -0,0 +1,312 @@
+"""Sharded runs: several worker processes, or machines sharing a directory, check one URL list.
+
+The URL list is split into shards of SHARD_SIZE URLs in an SQLite queue.
+A worker leases one shard at a time and records each row as it finishes,
+which also renews the lease. If a worker dies, its lease expires and
+another worker takes the shard over, re-checking only the URLs that have
+no row yet. Workers merge their per-URL state (fetch modes, ready times,
+strategy hits, extraction memo) into the shared files under a file lock.
+Once every shard is done, merge writes the reports and the
+history update in URL-list order, as a single run would have.
+
+    python -m fortra_check.shard --workers 4 --browser chrome       # init, 4 local workers, merge
+    python -m fortra_check.shard init --queue /shared/queue.db      # or step by step, on several machines:
+    python -m fortra_check.shard work --queue /shared/queue.db      #   on each machine
+    python -m fortra_check.shard merge --queue /shared/queue.db     #   once all shards are done
+
+All workers flag against the previous versions recorded by init. The
+queue uses SQLite's rollback journal rather than WAL, so it also works on
+a network share.
+"""
+import json
+import os
+import socket
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+from . import settings
+from .cli import load_urls, make_fetcher
+from .options import build_parser
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shards (
+    shard INTEGER PRIMARY KEY,
+    state TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS urls (
+    position INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    shard INTEGER NOT NULL,
+    row TEXT
+);
+CREATE INDEX IF NOT EXISTS urls_shard ON urls (shard, position);
+"""
+
+
+class ShardQueue:
+    """Lease-based work queue of URL shards in an SQLite file."""
+
+    def __init__(self, path=settings.SHARD_QUEUE_FILE):
+        self.path = path
+        # Autocommit; every change that needs to be atomic runs in its own BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.executescript(SCHEMA)
+
+    def create(self, urls, run_id, previous_versions, done=None, shard_size=settings.SHARD_SIZE):
+        """Fill the queue with urls; rows already in done ({url: row}) are stored as finished."""
+        done = done or {}
+        shards = (len(urls) + shard_size - 1) // shard_size
+        with self.transaction():
+            for table in ('meta', 'shards', 'urls'):
+                self.conn.execute(f"DELETE FROM {table}")
+            self.conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)",
+                                  [('run_id', run_id), ('previous_versions', json.dumps(previous_versions))])
+            self.conn.executemany("INSERT INTO shards (shard) VALUES (?)", [(shard,) for shard in range(shards)])
+            self.conn.executemany("INSERT INTO urls (position, url, shard, row) VALUES (?, ?, ?, ?)",
+                                  [(position, url, position // shard_size,
+                                    json.dumps(done[url]) if url in done else None)
+                                   for position, url in enumerate(urls)])
+            # Shards that need no checks at all are done already
+            self.conn.execute("UPDATE shards SET state = 'done' WHERE shard NOT IN "
+                              "(SELECT shard FROM urls WHERE row IS NULL)")
+        return shards
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT, so two workers never lease the same shard."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def meta(self):
+        """(run_id, previous_versions) recorded by create()."""
+        values = dict(self.conn.execute("SELECT key, value FROM meta"))
+        if 'run_id' not in values:
+            raise RuntimeError(f"{self.path} has no run; create it with: python -m fortra_check.shard init")
+        return values['run_id'], json.loads(values['previous_versions'])
+
+    def lease(self, worker, lease_seconds=settings.SHARD_LEASE):
+        """Lease the next pending or expired shard to worker; returns (shard, [(position, url)]) or None."""
+        now = time.time()
+        with self.transaction():
+            found = self.conn.execute(
+                "SELECT shard FROM shards WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY shard LIMIT 1", (now,)).fetchone()
+            if found is None:
+                return None
+            shard = found[0]
+            self.conn.execute("UPDATE shards SET state = 'leased', worker = ?, lease_expires = ?, "
+                              "attempts = attempts + 1 WHERE shard = ?", (worker, now + lease_seconds, shard))
+            todo = self.conn.execute("SELECT position, url FROM urls WHERE shard = ? AND row IS NULL "
+                                     "ORDER BY position", (shard,)).fetchall()
+        return shard, todo
+
+    def record(self, worker, shard, position, row, lease_seconds=settings.SHARD_LEASE):
+        """Store one finished row and renew worker's lease on the shard."""
+        with self.transaction():
+            self.conn.execute("UPDATE urls SET row = ? WHERE position = ?", (json.dumps(row), position))
+            self.conn.execute("UPDATE shards SET lease_expires = ? "
+                              "WHERE shard = ? AND worker = ? AND state = 'leased'",
+                              (time.time() + lease_seconds, shard, worker))
+
+    def complete(self, shard):
+        """Mark shard done once none of its URLs is missing a row."""
+        with self.transaction():
+            self.conn.execute("UPDATE shards SET state = 'done' WHERE shard = ? AND NOT EXISTS "
+                              "(SELECT 1 FROM urls WHERE shard = ? AND row IS NULL)", (shard, shard))
+
+    def next_expiry(self):
+        """Seconds until a leased shard may be taken over: 0 if one is pending, None if all are done."""
+        pending, expires = self.conn.execute(
+            "SELECT MAX(state = 'pending'), MIN(lease_expires) FROM shards WHERE state != 'done'").fetchone()
+        if pending is None:
+            return None
+        if pending:
+            return 0
+        return max(0.0, expires - time.time())
+
+    def rows(self):
+        """Every row in URL-list order, None for URLs not checked yet."""
+        return [json.loads(row) if row is not None else None
+                for (row,) in self.conn.execute("SELECT row FROM urls ORDER BY position")]
+
+    def close(self):
+        self.conn.close()
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def init(args):
+    """Create the queue for args.urls_file and start a run in the history database."""
+    from .history import HistoryStore
+
+    urls = load_urls(args.urls_file)
+    history = HistoryStore(args.history_db)
+    history.import_json(args.previous_versions)
+    skipped = {}
+    if args.scheduled:
+        from .schedule import skipped_rows
+
+        skipped = skipped_rows(urls, history, args)
+    run_id = history.start_run()
+    previous_versions = history.previous_versions()
+    history.close()
+
+    queue = ShardQueue(args.queue)
+    shards = queue.create(urls, run_id, previous_versions, done=skipped, shard_size=args.shard_size)
+    queue.close()
+    print(f"Queued {len(urls)} URLs in {shards} shards in {args.queue}")
+
+
+def work(args):
+    """Lease and check shards until every shard is done."""
+    from .crawl import crawl
+    from .engine import check_url
+
+    queue = ShardQueue(args.queue)
+    run_id, previous_versions = queue.meta()
+    worker = worker_name()
+    fetcher = make_fetcher(args)
+    # Releases walked from pages travel with the rows and are recorded by merge
+    history = None
+    if args.release_history:
+        from .history import HistoryStore
+
+        history = HistoryStore(args.history_db)
+
+    def check(url):
+        return check_url(url, fetcher, previous_versions,
+                         known_releases=history.known_releases if history is not None else None)
+
+    checked = 0
+    try:
+        while True:
+            leased = queue.lease(worker, args.lease)
+            if leased is None:
+                wait = queue.next_expiry()
+                if wait is None:
+                    break  # Every shard is done
+                # The rest is leased to other workers: wait for them to finish,
+                # or take over a shard whose lease runs out
+                time.sleep(min(wait, 1.0) or 0.1)
+                continue
+            shard, todo = leased
+            positions = iter(position for position, _ in todo)
+            checked += crawl([url for _, url in todo], check,
+                             concurrency=max(args.concurrency, args.browsers), per_host=args.per_host,
+                             on_result=lambda row: queue.record(worker, shard, next(positions), row, args.lease))
+            queue.complete(shard)
+    finally:
+        fetcher.close()
+        queue.close()
+        if history is not None:
+            history.close()
+    print(f"Worker {worker} checked {checked} URLs")
+    return checked
+
+
+def merge(args):
+    """Write the reports and the history update of a finished queue in URL-list order; returns the row count."""
+    from .history import HistoryStore
+    from .report import ReportWriters, open_file, write_previous_versions
+    from .schedule import SKIPPED
+
+    queue = ShardQueue(args.queue)
+    run_id, _ = queue.meta()
+    rows = queue.rows()
+    queue.close()
+    missing = sum(row is None for row in rows)
+    if missing:
+        print(f"Error: {missing} of {len(rows)} URLs in {args.queue} are not checked yet; "
+              f"run more workers or wait for them to finish", file=sys.stderr)
+        sys.exit(1)
+
+    history = HistoryStore(args.history_db)
+    reports = ReportWriters(args.output, args.csv, args.jsonl)
+    complete = published = False
+    try:
+        for row in rows:
+            if row['flag'] != SKIPPED:
+                history.record(run_id, row)
+            reports.write(row)
+        complete = True
+    finally:
+        published = reports.close(complete)
+        if complete:
+            history.finish_run(run_id)
+            write_previous_versions(args.previous_versions, history.previous_versions())
+        history.close()
+    if not published:
+        # Keep the rows so merge can be run again once the report can be written
+        print(f"Error: the reports were not written; {args.queue} is kept, run merge again", file=sys.stderr)
+        sys.exit(1)
+    os.remove(args.queue)
+    print(f"Merged {len(rows)} rows from {args.queue}")
+
+    if not args.no_open:
+        open_file(args.output)
+    return len(rows)
+
+
+def run(args):
+    """init, args.workers local worker processes, then merge."""
+    import multiprocessing
+
+    init(args)
+    started = time.perf_counter()
+    workers = [multiprocessing.Process(target=work, args=(args,), name=f'shard-worker-{n}')
+               for n in range(args.workers)]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        # The queue keeps the finished rows; `work` then `merge` continue the run
+        for process in workers:
+            process.terminate()
+        raise
+    print(f"{args.workers} workers finished in {time.perf_counter() - started:.1f}s")
+    return merge(args)
+
+
+COMMANDS = {'run': run, 'init': init, 'work': work, 'merge': merge}
+
+
+def main(argv=None):
+    parser = build_parser('Check Fortra release-note pages with several worker processes or machines.',
+                          run_budget=False)
+    parser.add_argument('command', nargs='?', choices=COMMANDS, default='run',
+                        help='run (default): init, start --workers local workers and merge; '
+                             'init / work / merge: one step, e.g. on machines sharing --queue')
+    parser.add_argument('--queue', default=settings.SHARD_QUEUE_FILE,
+                        help='SQLite work queue, on a shared directory for several machines '
+                             '(default: .fortra_cache/shard_queue.db)')
+    parser.add_argument('--workers', type=int, default=settings.SHARD_WORKERS,
+                        help='Worker processes started by run (default: 4)')
+    parser.add_argument('--shard-size', type=int, default=settings.SHARD_SIZE,
+                        help='URLs leased to a worker at a time (default: 8)')
+    parser.add_argument('--lease', type=float, default=settings.SHARD_LEASE, metavar='SECONDS',
+                        help="How long a worker's shard stays leased without a finished URL (default: 300)")
+    args = parser.parse_args(argv)
+    os.makedirs(os.path.dirname(os.path.abspath(args.queue)), exist_ok=True)
+    COMMANDS[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Small JSON state files kept between runs.
+
+Several processes may share these files (shard workers, a watch next to a
+one-off run), so writes go to a temporary file that replaces the original,
+and update_json merges a process's changes into whatever is on disk under
+a file lock instead of overwriting other processes' entries.
+"""
+import json
+import os
+import sys
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def load_json(path):
+    """Load a JSON object from path, returning {} if missing or invalid."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except json.JSONDecodeError as e:
+        print(f"Warning: {path} is not valid JSON ({e})", file=sys.stderr)
+        return {}
+
+
+def write_json(path, data, indent=4):
+    """Write data to path atomically: readers see the old file or the new one, never half of it."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+
+
+def save_json(path, data):
+    """Write data to path as indented JSON, creating the directory if needed."""
+    try:
+        write_json(path, data)
+    except OSError as e:
+        print(f"Error writing {path}: {e}", file=sys.stderr)
+
+
+@contextmanager
+def locked(path):
+    """Hold an exclusive lock on path + '.lock' for the duration of the block."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.lock", 'a+') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        else:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+            else:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def update_json(path, merge, indent=4):
+    """Replace the JSON at path with merge(current contents) under a lock; returns the merged data.
+
+    merge should apply only the entries this process changed, so concurrent
+    writers of other entries keep theirs.
+    """
+    try:
+        with locked(path):
+            data = merge(load_json(path))
+            write_json(path, data, indent)
+        return data
+    except OSError as e:
+        print(f"Error writing {path}: {e}", file=sys.stderr)
+        return None
+
+
+def merge_changes(data, changes):
+    """Shallow merge for update_json: data with changes ({key: value}) applied."""
+    data.update(changes)
+    return data
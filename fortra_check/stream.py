@@ -0,0 +1,114 @@
+"""Early-exit extraction fed chunk by chunk from the HTTP response stream."""
+import codecs
+from html.parser import HTMLParser
+
+from . import settings
+from .extract import product_name_from_url
+from .rules import DIGIT_RE
+from .timing import note
+
+
+class StreamingExtractor(HTMLParser):
+    """Event-driven version of a HeadingStrategy (h1 / h3 -> h5 -> p.release-date by default).
+
+    `done` becomes true as soon as the product name, a version containing a
+    digit and its release date have been seen; the rest of the page is not
+    needed. `failed` becomes true when the heading path cannot succeed, in which
+    case the caller has to read the whole page and use the full extractor.
+    """
+
+    def __init__(self, strategy):
+        super().__init__(convert_charrefs=True)
+        self.strategy = strategy
+        self.name = None
+        self.seen_anchor = False
+        self.version_tag_seen = False
+        self.version = None
+        self.date = None
+        self.failed = False
+        self.capturing = None  # Tag whose text is being collected
+        self.capture_depth = 0
+        self.captured = []
+
+    @property
+    def done(self):
+        return self.name is not None and self.version is not None and self.date is not None
+
+    def handle_starttag(self, tag, attrs):
+        if self.capturing is not None:
+            if tag == self.capturing:
+                self.capture_depth += 1
+            return
+        if tag == 'h1' and self.name is None:
+            self.start_capture(tag)
+        elif tag == self.strategy.anchor:
+            self.seen_anchor = True
+        elif tag == self.strategy.version_tag and self.seen_anchor and not self.version_tag_seen:
+            self.version_tag_seen = True
+            self.start_capture(tag)
+        elif tag == 'p' and self.version is not None and self.date is None:
+            classes = (dict(attrs).get('class') or '').split()
+            if 'release-date' in classes:
+                self.start_capture(tag)
+
+    def handle_endtag(self, tag):
+        if tag != self.capturing:
+            return
+        self.capture_depth -= 1
+        if self.capture_depth:
+            return
+        text = ''.join(self.captured).strip()
+        self.capturing = None
+        self.captured = []
+        if tag == 'h1':
+            self.name = text
+        elif tag == self.strategy.version_tag:
+            match = self.strategy.version_re.search(text)
+            if match and DIGIT_RE.search(match.group(1)):
+                self.version = match.group(1)
+            else:
+                self.failed = True
+        elif tag == 'p':
+            self.date = text
+
+    def handle_data(self, data):
+        if self.capturing is not None:
+            self.captured.append(data)
+
+    def start_capture(self, tag):
+        self.capturing = tag
+        self.capture_depth = 1
+        self.captured = []
+
+    def release(self, url):
+        return {'name': self.name if self.name is not None else product_name_from_url(url),
+                'version': self.version, 'date': self.date}
+
+
+def stream_release(response, url, charset, extract, strategy, rules, chunk_size=settings.STREAM_CHUNK_SIZE):
+    """Read a preload_content=False response until strategy has found the release.
+
+    Returns (page_source, release, partial). When the extractor stopped
+    early, partial is true and page_source is only the part of the body that
+    was read; otherwise the whole body is read and passed to
+    extract(page_source, url).
+    """
+    decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+    extractor = StreamingExtractor(strategy)
+    chunks = []
+    for raw in response.stream(chunk_size):
+        note(bytes=len(raw))
+        text = decoder.decode(raw)
+        chunks.append(text)
+        if extractor.failed:
+            continue
+        extractor.feed(text)
+        if extractor.done:
+            # Drop the unread rest of the body; this also closes the connection
+            response.close()
+            rules.record(url, [strategy.name])
+            return ''.join(chunks), extractor.release(url), True
+
+    chunks.append(decoder.decode(b'', final=True))
+    page_source = ''.join(chunks)
+    return page_source, extract(page_source, url), False
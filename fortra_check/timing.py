@@ -0,0 +1,176 @@
+"""Per-URL stage timing.
+
+check_url() opens a UrlTiming for the URL it checks; code further down
+the fetch path adds to it with `with stage('parse'):` and note(), without
+the timing object being passed around (it is kept per thread). Outside a
+measured check both are no-ops.
+
+Stages: http (request and download), navigate (driver.get), ready
+(readiness wait), page_source, parse (building the document), extract
+(heading strategies), fallback (page-text strategies), compare (flagging),
+history (walking the page's releases with --release-history).
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+STAGES = ('http', 'navigate', 'ready', 'page_source', 'parse', 'extract', 'fallback', 'compare', 'history')
+
+_current = threading.local()
+
+
+class UrlTiming:
+    def __init__(self, url):
+        self.url = url
+        self.stages = {}
+        self.bytes = 0
+        self.cache = 'miss'  # miss, not-modified (HTTP 304) or memo (parse skipped)
+        self.mode = None  # http or browser
+        self.total = 0.0
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def as_dict(self):
+        return {'url': self.url, 'total': round(self.total, 6), 'mode': self.mode, 'cache': self.cache,
+                'bytes': self.bytes, 'stages': {name: round(seconds, 6) for name, seconds in self.stages.items()}}
+
+
+@contextmanager
+def stage(name):
+    """Add the time spent in the block to the current URL's stage `name`."""
+    timing = getattr(_current, 'timing', None)
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - start)
+
+
+def note(bytes=0, cache=None, mode=None):
+    """Record bytes fetched, the cache outcome or the fetch mode for the current URL."""
+    timing = getattr(_current, 'timing', None)
+    if timing is None:
+        return
+    timing.bytes += bytes
+    if cache is not None:
+        timing.cache = cache
+    if mode is not None:
+        timing.mode = mode
+
+
+class Timings:
+    """Timings of every URL in a run, exported as JSON or a Prometheus textfile."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.urls = []
+
+    @contextmanager
+    def measure(self, url):
+        timing = UrlTiming(url)
+        _current.timing = timing
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.total = time.perf_counter() - start
+            _current.timing = None
+            with self.lock:
+                self.urls.append(timing)
+
+    def stage_totals(self):
+        totals = {}
+        for timing in self.urls:
+            for name, seconds in timing.stages.items():
+                totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+    def write_json(self, path):
+        with self.lock:
+            urls = sorted(self.urls, key=lambda timing: timing.total, reverse=True)
+            report = {'urls': [timing.as_dict() for timing in urls],
+                      'stage_totals': {name: round(seconds, 6) for name, seconds in self.stage_totals().items()},
+                      'total_bytes': sum(timing.bytes for timing in urls)}
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=4)
+        print(f"Timings written to {path}")
+
+    def write_prometheus(self, path):
+        """Write a node_exporter textfile collector file (atomically, as it may be scraped any time)."""
+        lines = [
+            '# HELP fortra_check_stage_seconds Time spent per URL and stage in the last run.',
+            '# TYPE fortra_check_stage_seconds gauge',
+        ]
+        with self.lock:
+            urls = list(self.urls)
+        for timing in urls:
+            for name, seconds in timing.stages.items():
+                lines.append(f'fortra_check_stage_seconds{{url="{escape(timing.url)}",stage="{name}"}} {seconds:.6f}')
+        lines += ['# HELP fortra_check_url_seconds Total check time per URL in the last run.',
+                  '# TYPE fortra_check_url_seconds gauge']
+        lines += [f'fortra_check_url_seconds{{url="{escape(t.url)}",mode="{t.mode}",cache="{t.cache}"}} {t.total:.6f}'
+                  for t in urls]
+        lines += ['# HELP fortra_check_url_bytes Bytes fetched per URL in the last run.',
+                  '# TYPE fortra_check_url_bytes gauge']
+        lines += [f'fortra_check_url_bytes{{url="{escape(t.url)}"}} {t.bytes}' for t in urls]
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+        print(f"Metrics written to {path}")
+
+    def summary(self, top=5):
+        """Print the slowest URLs and where the run's time went."""
+        with self.lock:
+            slowest = sorted(self.urls, key=lambda timing: timing.total, reverse=True)[:top]
+        totals = self.stage_totals()
+        print("Time per stage: " + ', '.join(f"{name} {totals[name]:.2f}s" for name in STAGES if name in totals))
+        for timing in slowest:
+            print(f"  {timing.total:6.2f}s  {timing.url}")
+
+
+def escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RunProfiler:
+    """cProfile and tracemalloc over a whole run.
+
+    cProfile only sees the thread it was enabled in, and from Python 3.12 only
+    one profiler can be active at a time, so profiled runs check their URLs
+    one after another in the thread that called start().
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def start(self):
+        import cProfile
+        import tracemalloc
+
+        tracemalloc.start()
+        self.main = cProfile.Profile()
+        self.main.enable()
+
+    def stop(self):
+        """Save the profile to path and print the top functions and allocations."""
+        import pstats
+        import tracemalloc
+
+        self.main.disable()
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        stats = pstats.Stats(self.main)
+        stats.dump_stats(self.path)
+        stats.sort_stats('cumulative').print_stats(20)
+        print(f"Peak traced memory: {peak / 1e6:.1f} MB; largest allocations:")
+        for stat in snapshot.statistics('lineno')[:10]:
+            print(f"  {stat}")
+        print(f"Profile written to {self.path} (view with python -m pstats {self.path})")
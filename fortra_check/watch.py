@@ -0,0 +1,207 @@
+"""Watch mode: keep the fetcher warm, re-check on a schedule and serve the status locally.
+
+The HTTP connection pool and any browsers that were needed stay open
+between checks, so only the first check pays for starting Brave/ChromeDriver.
+The latest row of every product is kept in memory and served as JSON; a
+failed check keeps the last good version and adds its error as last_error:
+
+    python -m fortra_check.watch --browser brave --interval 3600
+    curl http://127.0.0.1:8787/status
+    curl "http://127.0.0.1:8787/products/Powertech Antivirus for IBM i"
+    curl "http://127.0.0.1:8787/products/Powertech Antivirus for IBM i?version=8.12"
+
+With ?version=, the reply includes compare_versions() of the current
+version against it ("New" means the page has a newer version, "Invalid"
+that no version is known).
+"""
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from . import settings
+from .cli import load_urls, make_fetcher
+from .extract import compare_versions, is_valid_version
+from .options import build_parser
+
+
+class StatusBoard:
+    """Latest status row per product, safe to read while a check is running."""
+
+    def __init__(self, rows=()):
+        self.lock = threading.Lock()
+        self.products = {}
+        self.checking = False
+        self.last_check = None
+        for row in rows:
+            self.update(row)
+
+    def update(self, row):
+        """Show row for its product, unless it failed and a good version is already shown."""
+        key = row['name'].casefold()
+        with self.lock:
+            last = self.products.get(key)
+            if is_valid_version(row['version']) or last is None or not is_valid_version(last['version']):
+                self.products[key] = row
+            else:
+                error = row['date'] if row['version'] == 'Error' else row['version']
+                self.products[key] = {**last, 'last_error': error}
+
+    def get(self, name):
+        with self.lock:
+            return self.products.get(name.strip().casefold())
+
+    def snapshot(self):
+        with self.lock:
+            return {'checking': self.checking, 'last_check': self.last_check, 'products': list(self.products.values())}
+
+    def check_started(self):
+        with self.lock:
+            self.checking = True
+
+    def check_finished(self):
+        with self.lock:
+            self.checking = False
+            self.last_check = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """GET /status, /products/<name>[?version=X] and /health."""
+
+    board = None  # Set on the subclass created by serve()
+
+    def do_GET(self):
+        request = urlparse(self.path)
+        if request.path == '/health':
+            self.reply(200, {'ok': True})
+        elif request.path == '/status':
+            self.reply(200, self.board.snapshot())
+        elif request.path.startswith('/products/'):
+            name = unquote(request.path[len('/products/'):])
+            row = self.board.get(name)
+            if row is None:
+                self.reply(404, {'error': f"Unknown product {name!r}"})
+                return
+            reply = dict(row)
+            version = parse_qs(request.query).get('version')
+            if version:
+                reply['compared_to'] = version[0]
+                reply['comparison'] = (compare_versions(row['version'], version[0])
+                                       if is_valid_version(row['version']) else 'Invalid')
+            self.reply(200, reply)
+        else:
+            self.reply(404, {'error': 'Use /status, /products/<name> or /health'})
+
+    def reply(self, status, body):
+        payload = json.dumps(body, indent=4).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass  # Queries are frequent; keep the console for check output
+
+
+def serve(board, host='127.0.0.1', port=settings.WATCH_PORT):
+    """Start the status API in a background thread and return the server."""
+    handler = type('BoundStatusHandler', (StatusHandler,), {'board': board})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name='status-api', daemon=True).start()
+    print(f"Serving status on http://{host}:{server.server_port}/status")
+    return server
+
+
+class Watcher:
+    """Re-check args.urls_file every args.interval seconds with one long-lived Fetcher."""
+
+    def __init__(self, args):
+        from .history import HistoryStore
+
+        self.args = args
+        self.history = HistoryStore(args.history_db)
+        self.history.import_json(args.previous_versions)
+        self.board = StatusBoard(self.history.latest_releases())
+        self.fetcher = make_fetcher(args)
+        self.stop = threading.Event()
+
+    def check_all(self):
+        """One full check of the URL list, as a regular run would do it."""
+        from .crawl import crawl
+        from .engine import check_url
+        from .report import ReportWriters, write_previous_versions
+
+        urls = load_urls(self.args.urls_file)  # Re-read so edits apply to the next check
+        if self.args.run_budget:
+            self.fetcher.run_deadline = time.monotonic() + self.args.run_budget
+        previous_versions = self.history.previous_versions()
+        run_id = self.history.start_run()
+        reports = ReportWriters(self.args.output, self.args.csv, self.args.jsonl)
+        skipped = {}
+        if self.args.scheduled:
+            from .schedule import skipped_rows
+
+            skipped = skipped_rows(urls, self.history, self.args)
+
+        def check(url):
+            if url in skipped:
+                return skipped[url]
+            return check_url(url, self.fetcher, previous_versions,
+                             known_releases=self.history.known_releases if self.args.release_history else None)
+
+        def emit(row):
+            if row['url'] not in skipped:
+                self.history.record(run_id, row)
+                self.board.update(row)
+            reports.write(row)
+
+        self.board.check_started()
+        complete = False
+        try:
+            crawl(urls, check,
+                  concurrency=max(self.args.concurrency, self.args.browsers), per_host=self.args.per_host,
+                  on_result=emit)
+            complete = True
+        finally:
+            reports.close(complete)
+            self.board.check_finished()
+        self.history.finish_run(run_id)
+        write_previous_versions(self.args.previous_versions, self.history.previous_versions())
+        self.fetcher.save()
+
+    def run(self):
+        server = serve(self.board, self.args.host, self.args.port)
+        try:
+            while not self.stop.is_set():
+                started = time.monotonic()
+                try:
+                    self.check_all()
+                except Exception as e:
+                    print(f"Check failed: {e}")
+                # Sleep out the rest of the interval, measured from the start of the check
+                self.stop.wait(max(0, self.args.interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+            self.fetcher.close()
+            self.history.close()
+
+
+def main(argv=None):
+    parser = build_parser('Re-check Fortra release-note pages on a schedule and serve the latest status.',
+                          opens_report=False)
+    parser.add_argument('--interval', type=float, default=settings.WATCH_INTERVAL,
+                        help='Seconds between the starts of two checks (default: 3600)')
+    parser.add_argument('--host', default='127.0.0.1', help='Address of the status API (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=settings.WATCH_PORT,
+                        help='Port of the status API (default: 8787, 0 = any free port)')
+    args = parser.parse_args(argv)
+    Watcher(args).run()
+
+
+if __name__ == "__main__":
+    main()
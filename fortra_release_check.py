@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+"""Check Fortra release-note pages for new product versions.
+
+Run with --help for options, e.g. --browser {brave,chrome,firefox,edge,safari,http}.
+"""
+from fortra_check.cli import main
+
+if __name__ == "__main__":
+    main()
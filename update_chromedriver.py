@@ -1,34 +1,31 @@
 #!/usr/bin/env python3
 
 import subprocess
+import base64
+import hashlib
 import json
 import os
+import shutil
+import struct
 import sys
+import tempfile
+import time
+import urllib.error
 import urllib.request
-import zipfile
-import shutil
-from pathlib import Path
-from packaging import version  # pip install packaging if needed
-import glob  # For finding the binary
+import zlib
+
+from fortra_check.drivers import default_binary
+from fortra_check.driverstore import DRIVER_DIR, DriverStore, browser_version, driver_platform
 
 # Configuration
-DRIVER_DIR = Path.home() / ".chromedrivers"
 BROWSER_PATHS = {
-    "Chrome": "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-    "Brave": "/Applications/Brave Browser.app/Contents/MacOS/Brave Browser"
+    "Chrome": default_binary("chrome"),
+    "Brave": default_binary("brave")
 }
 JSON_URL = "https://googlechromelabs.github.io/chrome-for-testing/known-good-versions-with-downloads.json"
-
-def get_browser_version(browser_path):
-    """Run browser --version and extract the version string."""
-    try:
-        result = subprocess.run([browser_path, "--version"], capture_output=True, text=True, check=True)
-        # Output like: "Brave Browser 141.1.83.109"
-        version_line = result.stdout.strip()
-        version = version_line.split()[-1]  # Last word is the version
-        return version
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return None
+INDEX_FILE = DRIVER_DIR / "driver_index.json"  # Latest driver per (major, platform), built from JSON_URL
+INDEX_MAX_AGE = 24 * 3600  # Seconds the index is used without revalidating JSON_URL
+CHUNK_SIZE = 64 * 1024
 
 def get_driver_version(driver_path):
     """Run chromedriver --version and extract the version string."""
@@ -41,147 +38,286 @@ def get_driver_version(driver_path):
     except (subprocess.CalledProcessError, FileNotFoundError):
         return None
 
-def get_architecture():
-    """Detect macOS architecture."""
-    arch = os.uname().machine
-    if arch == "arm64":
-        return "mac-arm64"
-    elif arch == "x86_64":
-        return "mac-x64"
-    else:
-        raise ValueError(f"Unsupported architecture: {arch}")
+def version_key(ver):
+    """Sort key for a dotted numeric version such as 141.0.7390.65."""
+    return tuple(int(part) for part in ver.split("."))
+
+def build_index(data):
+    """Map "major/platform" to [latest version, url] in one pass over the metadata."""
+    drivers = {}
+    for ver_info in data.get("versions", []):
+        ver = ver_info["version"]
+        major = ver.split(".")[0]
+        for download in ver_info.get("downloads", {}).get("chromedriver", []):
+            key = f"{major}/{download['platform']}"
+            if key not in drivers or version_key(ver) > version_key(drivers[key][0]):
+                drivers[key] = [ver, download["url"]]
+    return drivers
+
+def load_index():
+    try:
+        with open(INDEX_FILE, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def save_index(index):
+    DRIVER_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = INDEX_FILE.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, INDEX_FILE)
 
-def find_matching_driver(major_version):
-    """Fetch JSON and find the latest ChromeDriver matching major version."""
+def get_driver_index(max_age=INDEX_MAX_AGE):
+    """Return the cached driver index, revalidating it with a conditional GET once it is max_age old.
+
+    The full metadata is only downloaded and indexed when it changed; if the
+    request fails, the cached index is used as it is.
+    """
+    index = load_index()
+    if index and time.time() - index.get("checked_at", 0) < max_age:
+        return index
+
+    request = urllib.request.Request(JSON_URL)
+    if index:
+        if index.get("etag"):
+            request.add_header("If-None-Match", index["etag"])
+        if index.get("last_modified"):
+            request.add_header("If-Modified-Since", index["last_modified"])
     try:
-        with urllib.request.urlopen(JSON_URL) as response:
+        with urllib.request.urlopen(request, timeout=30) as response:
             data = json.loads(response.read().decode())
-        
-        versions = data.get("versions", [])
-        matching_versions = []
-        for ver_info in versions:
-            if ver_info["version"].startswith(f"{major_version}."):
-                downloads = ver_info.get("downloads", {}).get("chromedriver", [])
-                platform_downloads = [d for d in downloads if d["platform"] == get_architecture()]
-                if platform_downloads:
-                    matching_versions.append((ver_info["version"], platform_downloads[0]["url"]))
-        
-        if not matching_versions:
-            return None, None
-        
-        # Sort by version descending and pick the latest
-        matching_versions.sort(key=lambda x: version.parse(x[0]), reverse=True)
-        latest_version, url = matching_versions[0]
-        return url, latest_version
-    except Exception as e:
-        print(f"Error fetching versions: {e}", file=sys.stderr)
+            index = {"etag": response.headers.get("ETag"),
+                     "last_modified": response.headers.get("Last-Modified"),
+                     "drivers": build_index(data)}
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not index:
+            return fall_back_to(index, e)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        return fall_back_to(index, e)
+    index["checked_at"] = time.time()
+    save_index(index)
+    return index
+
+def fall_back_to(index, error):
+    if index:
+        print(f"Could not revalidate driver versions ({error}); using the cached index.", file=sys.stderr)
+    else:
+        print(f"Error fetching versions: {error}", file=sys.stderr)
+    return index
+
+def find_matching_driver(major_version, platform=None):
+    """Look up the latest ChromeDriver for major version in the driver index; returns (url, version)."""
+    index = get_driver_index()
+    if not index:
         return None, None
+    entry = index["drivers"].get(f"{major_version}/{platform or driver_platform()}")
+    if not entry:
+        return None, None
+    latest_version, url = entry
+    return url, latest_version
+
+class DownloadReader:
+    """Reads a download in chunks, hashing and counting every byte; unused bytes can be pushed back."""
+
+    def __init__(self, response):
+        self.response = response
+        self.md5 = hashlib.md5()
+        self.size = 0
+        self.pending = b""
 
-def download_and_extract(url, driver_dir, major_version):
-    """Download ZIP, robustly extract/move chromedriver to root, and make executable."""
-    driver_dir.mkdir(parents=True, exist_ok=True)
-    zip_path = driver_dir / f"chromedriver_{major_version}.zip"
-    
+    def read(self, n=CHUNK_SIZE):
+        if self.pending:
+            data, self.pending = self.pending[:n], self.pending[n:]
+            return data
+        data = self.response.read(n)
+        self.md5.update(data)
+        self.size += len(data)
+        return data
+
+    def read_exact(self, n):
+        data = b""
+        while len(data) < n:
+            chunk = self.read(n - len(data))
+            if not chunk:
+                raise EOFError("Download ended in the middle of the archive")
+            data += chunk
+        return data
+
+    def unread(self, data):
+        self.pending = data + self.pending
+
+    def drain(self):
+        while self.read():
+            pass
+
+def copy_member(reader, flags, method, compressed_size, out):
+    """Copy one member's data from reader to out (None to skip it); returns (crc32, size) of its content."""
+    if method not in (0, 8):
+        raise ValueError(f"Unsupported ZIP compression method {method}")
+    descriptor = flags & 0x08  # Sizes follow the data instead of being in the header
+    if descriptor and method == 0:
+        raise ValueError("Stored ZIP member without sizes")
+    decompressor = zlib.decompressobj(-15) if method == 8 else None
+    remaining = None if descriptor else compressed_size
+    crc, size = 0, 0
+    while remaining is None or remaining > 0:
+        chunk = reader.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+        if not chunk:
+            raise EOFError("Download ended in the middle of the archive")
+        if remaining is not None:
+            remaining -= len(chunk)
+            if out is None:
+                continue  # Skipped member of known size: no need to inflate it
+        data = decompressor.decompress(chunk) if decompressor else chunk
+        crc = zlib.crc32(data, crc)
+        size += len(data)
+        if out is not None:
+            out.write(data)
+        if decompressor and decompressor.eof:
+            reader.unread(decompressor.unused_data)
+            break
+    return crc, size
+
+def stream_driver(reader, out):
+    """Walk the ZIP's local headers as they arrive and write the chromedriver member's content to out.
+
+    Returns the member's name, or None if the archive has no chromedriver.
+    """
+    found = None
+    while True:
+        signature = reader.read_exact(4)
+        if signature != b"PK\x03\x04":
+            return found  # Central directory: no more members
+        (flags, method, crc, compressed_size, size,
+         name_length, extra_length) = struct.unpack("<2xHH4xIIIHH", reader.read_exact(26))
+        name = reader.read_exact(name_length).decode("utf-8", errors="replace")
+        reader.read_exact(extra_length)  # Extra fields are not needed
+        if compressed_size == 0xFFFFFFFF:
+            raise ValueError("ZIP64 archives are not supported")
+        wanted = found is None and name.rsplit("/", 1)[-1] in ("chromedriver", "chromedriver.exe")
+        actual_crc, actual_size = copy_member(reader, flags, method, compressed_size, out if wanted else None)
+        if flags & 0x08:
+            descriptor = reader.read_exact(12)
+            if descriptor[:4] == b"PK\x07\x08":
+                descriptor = descriptor[4:] + reader.read_exact(4)
+            crc, compressed_size, size = struct.unpack("<III", descriptor)
+        if wanted:
+            if (actual_crc, actual_size) != (crc, size):
+                raise ValueError(f"{name} is corrupt (CRC or size mismatch)")
+            found = name
+
+def published_md5(response):
+    """The MD5 the download server publishes in x-goog-hash, as bytes, or None."""
+    for part in (response.headers.get("x-goog-hash") or "").split(","):
+        algorithm, _, value = part.strip().partition("=")
+        if algorithm == "md5":
+            return base64.b64decode(value)
+    return None
+
+def download_and_extract(url, final_path):
+    """Stream the ZIP, extract only chromedriver as it downloads, verify it, and swap it in atomically.
+
+    The driver is written to a temporary file next to final_path and renamed
+    over it only once the download's published MD5 / size and the member's
+    CRC check out, so a running checker never sees a partial driver.
+    """
+    final_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(dir=final_path.parent, prefix=".chromedriver-", delete=False)
     try:
         print(f"Downloading from {url}...")
-        urllib.request.urlretrieve(url, zip_path)
-        
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(driver_dir)
-        
-        final_path = driver_dir / "chromedriver"
-        
-        # Find chromedriver binary (direct or in subdir)
-        candidates = list(driver_dir.rglob("chromedriver"))  # Recursive, but shallow in practice
-        if len(candidates) == 0:
+        with urllib.request.urlopen(url, timeout=60) as response, tmp:
+            reader = DownloadReader(response)
+            member = stream_driver(reader, tmp)
+            reader.drain()
+            expected_size = response.headers.get("Content-Length")
+            expected_md5 = published_md5(response)
+        if member is None:
             print("Error: chromedriver not found in ZIP.", file=sys.stderr)
-            # Debug: List all extracted files
-            print("Extracted files:", [p.name for p in driver_dir.rglob("*") if p.is_file()])
             return False
-        elif len(candidates) > 1:
-            print("Error: Multiple chromedriver files found.", file=sys.stderr)
+        if expected_size is not None and int(expected_size) != reader.size:
+            print(f"Error: downloaded {reader.size} bytes, expected {expected_size}.", file=sys.stderr)
             return False
-        
-        chromedriver_found = candidates[0]
-        if chromedriver_found != final_path:
-            # Move from subdir to root
-            print(f"Moving {chromedriver_found} to root...")
-            chromedriver_found.rename(final_path)
-            # Remove the now-empty parent subdir
-            parent_dir = chromedriver_found.parent
-            if parent_dir != driver_dir and parent_dir.exists():
-                shutil.rmtree(parent_dir)
-        
-        # Make executable
-        os.chmod(final_path, 0o755)
+        if expected_md5 is not None and expected_md5 != reader.md5.digest():
+            print("Error: download checksum does not match the published MD5.", file=sys.stderr)
+            return False
+
+        os.chmod(tmp.name, 0o755)
+        os.replace(tmp.name, final_path)
         print(f"ChromeDriver installed to {final_path}")
         return True
     except Exception as e:
         print(f"Download/extract error: {e}", file=sys.stderr)
         return False
     finally:
-        if zip_path.exists():
-            os.remove(zip_path)
-        # Clean up any other potential empty subdirs (e.g., from previous runs)
-        for sub in driver_dir.iterdir():
-            if sub.is_dir() and sub.name.startswith("chromedriver-"):
-                try:
-                    shutil.rmtree(sub)
-                    print(f"Cleaned up leftover directory: {sub}")
-                except OSError:
-                    pass  # Ignore if not empty or in use
+        if os.path.exists(tmp.name):
+            os.remove(tmp.name)
+        if not final_path.exists():
+            try:
+                final_path.parent.rmdir()  # Nothing was installed; don't leave an empty store entry
+            except OSError:
+                pass
+
+def link_current(driver_path):
+    """Point ~/.chromedrivers/chromedriver, used by the standalone scripts, at driver_path."""
+    current = DRIVER_DIR / driver_path.name
+    if current.exists() and os.path.samefile(current, driver_path):
+        return
+    tmp_path = DRIVER_DIR / f".{driver_path.name}-link"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.link(driver_path, tmp_path)
+    except OSError:
+        shutil.copy2(driver_path, tmp_path)
+    os.replace(tmp_path, current)
+    print(f"{current} now points to {driver_path}")
 
 def main():
-    # Find installed browser
-    browser = None
-    version = None
+    # Find installed browsers; versions are only re-probed when a browser binary changed
+    installed = {}
     for name, path in BROWSER_PATHS.items():
-        if os.path.exists(path):
-            version = get_browser_version(path)
+        if path and os.path.exists(path):
+            version = browser_version(path)
             if version:
-                browser = name
-                break
-    
-    if not version:
+                installed[name] = version
+
+    if not installed:
         print("No supported browser (Chrome or Brave) found.", file=sys.stderr)
         sys.exit(1)
-    
-    print(f"Detected {browser} version: {version}")
-    browser_major = version.split(".")[0]
-    
-    # Check existing driver
-    existing_driver_path = DRIVER_DIR / "chromedriver"
-    if existing_driver_path.exists():
-        existing_version = get_driver_version(existing_driver_path)
-        if existing_version:
-            driver_major = existing_version.split(".")[0]
-            if driver_major == browser_major:
-                print(f"ChromeDriver already up-to-date: {existing_version} (major {driver_major} matches browser {browser_major})")
-                # Optional: Full verification
-                result = subprocess.run([str(existing_driver_path), "--version"], capture_output=True, text=True)
-                print(f"Verification: {result.stdout.strip()}")
-                sys.exit(0)  # Skip update
-            else:
-                print(f"Major version mismatch: Existing {driver_major} vs. needed {browser_major}. Updating...")
+
+    store = DriverStore()
+    platform = driver_platform()
+    failed = False
+    for browser, version in installed.items():
+        print(f"Detected {browser} version: {version}")
+        browser_major = version.split(".")[0]
+
+        # Drivers are kept side by side per major version, so a browser on another major needs no re-download
+        driver_path = store.get(browser_major, platform)
+        if driver_path:
+            print(f"ChromeDriver already up-to-date: {store.version(browser_major, platform)} at {driver_path}")
+            continue
+
+        url, driver_version = find_matching_driver(browser_major, platform)
+        if not url:
+            print(f"No matching ChromeDriver found for major version {browser_major}.", file=sys.stderr)
+            failed = True
+            continue
+
+        print(f"Downloading latest ChromeDriver {driver_version} for {browser_major}.x...")
+        driver_path = store.path(browser_major, platform)
+        if download_and_extract(url, driver_path):
+            store.add(browser_major, platform, driver_version)
+            print(f"Verification: ChromeDriver {get_driver_version(driver_path)}")
         else:
-            print("Existing chromedriver invalid (can't get version). Updating...")
-    else:
-        print("No existing ChromeDriver found. Downloading...")
-    
-    # Proceed to update
-    url, driver_version = find_matching_driver(browser_major)
-    if not url:
-        print(f"No matching ChromeDriver found for major version {browser_major}.", file=sys.stderr)
-        sys.exit(1)
-    
-    print(f"Downloading latest ChromeDriver {driver_version} for {browser_major}.x...")
-    if download_and_extract(url, DRIVER_DIR, browser_major):
-        print("Success! Add to PATH or use in Selenium: Service('/Users/sameera/.chromedrivers/chromedriver')")
-        # Verify new install
-        result = subprocess.run([str(DRIVER_DIR / "chromedriver"), "--version"], capture_output=True, text=True)
-        print(f"Verification: {result.stdout.strip()}")
-    else:
-        sys.exit(1)
+            failed = True
+
+    # The first browser found (Chrome, else Brave) gets the driver at the old single-driver path
+    first_major = next(iter(installed.values())).split(".")[0]
+    if store.path(first_major, platform).exists():
+        link_current(store.path(first_major, platform))
+    sys.exit(1 if failed else 0)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()